@@ -6,14 +6,13 @@ A comprehensive AI assistant with code analysis, git integration,
 voice commands, and system monitoring capabilities.
 """
 
-__version__ = "1.0.0"
+import importlib
+
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .core.config import ConfigManager
-from .core.database import EnhancedMemoryDB
-from .core.ai_interface import AIInterface
-from .core.data_models import Conversation, CodeAnalysis, Achievement
+# Used when the package is run from a source checkout without dist-info
+_FALLBACK_VERSION = "1.0.0"
 
 __all__ = [
     "ConfigManager",
@@ -22,4 +21,42 @@ __all__ = [
     "Conversation",
     "CodeAnalysis",
     "Achievement"
-]
\ No newline at end of file
+]
+
+# Public names are resolved on first access (PEP 562) so that importing the
+# package does not pull in sqlite, requests, rich, etc. up front.
+_LAZY = {
+    "ConfigManager": ".core.config",
+    "EnhancedMemoryDB": ".core.database",
+    "AIInterface": ".core.ai_interface",
+    "Conversation": ".core.data_models",
+    "CodeAnalysis": ".core.data_models",
+    "Achievement": ".core.data_models",
+}
+
+
+def _read_version():
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version("sarek")
+    except importlib.metadata.PackageNotFoundError:
+        return _FALLBACK_VERSION
+
+
+def __getattr__(name):
+    # Reading dist-info is deferred until the version is actually requested
+    if name == "__version__":
+        version = _read_version()
+        globals()["__version__"] = version
+        return version
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | {"__version__"})
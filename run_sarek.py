@@ -3,44 +3,78 @@
 Standalone runner for Sarek - handles missing dependencies gracefully
 """
 
-import sys
+import concurrent.futures
+import importlib
+import importlib.util
 import os
-import subprocess
-from pathlib import Path
+import sys
+
+# Only needed when running from a source checkout; an installed package
+# (console_scripts entry point) resolves sarek.main without this.
+if __package__ is None and not hasattr(sys, "frozen"):
+    _here = os.path.dirname(os.path.abspath(__file__))
+    if _here not in sys.path:
+        sys.path.insert(0, _here)
+
+_DEPENDENCIES = (
+    ("requests", "python3-requests"),
+    ("rich", "python3-rich"),
+    ("git", "python3-git"),
+    ("psutil", "python3-psutil"),
+)
+
+
+def _cached_import(module_path, item):
+    """Import an attribute from a module, skipping the import machinery if already loaded"""
+    modules = sys.modules
+    if module_path not in modules:
+        importlib.import_module(module_path)
+    return getattr(modules[module_path], item)
+
 
-sarek_dir = Path(__file__).parent / "sarek"
-sys.path.insert(0, str(sarek_dir.parent))
+def _is_available(module):
+    """Check whether a module can be imported without executing it"""
+    # Already imported (embedded/REPL use) - no need to consult the finders
+    if module in sys.modules:
+        return True
+    return importlib.util.find_spec(module) is not None
 
 
 def check_and_install_dependencies():
     """Check for dependencies and try to install them"""
-    dependencies = {
-        'requests': 'python3-requests',
-        'rich': 'python3-rich',
-        'git': 'python3-git',
-        'psutil': 'python3-psutil'
-    }
-
     missing = []
-
-    for module, apt_package in dependencies.items():
-        try:
-            __import__(module)
-            print(f"✅ {module} is available")
-        except ImportError:
+    lines = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda item: (item[0], item[1], _is_available(item[0])),
+            _DEPENDENCIES
+        ))
+
+    for module, apt_package, available in results:
+        if available:
+            lines.append(f"✅ {module} is available")
+        else:
             missing.append((module, apt_package))
-            print(f"❌ {module} is missing")
+            lines.append(f"❌ {module} is missing")
+
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.write("\n")
 
     if missing:
         print(f"\n🔧 Missing dependencies detected!")
         print("You can install them with:")
         print("sudo apt update")
-        apt_cmd = "sudo apt install " + " ".join([pkg for _, pkg in missing])
+        apt_cmd = "sudo apt install " + " ".join(pkg for _, pkg in missing)
         print(apt_cmd)
         print()
 
+        if not sys.stdin.isatty():
+            print("(non-interactive; exiting due to missing dependencies)")
+            sys.exit(1)
+
         response = input("Continue anyway? Some features may not work (y/N): ")
-        if response.lower() != 'y':
+        if response[:1] not in ('y', 'Y'):
             sys.exit(1)
 
     return len(missing) == 0
@@ -56,15 +90,17 @@ def main():
         print("⚠️  Running with limited functionality due to missing dependencies")
 
     try:
-        from sarek.main import main as sarek_main
+        sarek_main = _cached_import("sarek.main", "main")
         sarek_main()
     except ImportError as e:
-        print(f"❌ Failed to import Sarek: {e}")
-        print("Make sure you're running from the correct directory")
-        sys.exit(1)
+        message = f"❌ Failed to import Sarek: {e}\nMake sure you're running from the correct directory"
     except Exception as e:
-        print(f"❌ Error running Sarek: {e}")
-        sys.exit(1)
+        message = f"❌ Error running Sarek: {e}"
+    else:
+        return
+
+    print(message)
+    sys.exit(1)
 
 
 if __name__ == "__main__":
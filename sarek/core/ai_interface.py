@@ -3,38 +3,68 @@
 AI interface for Sarek AI Assistant
 """
 
-import requests
-from typing import List, Tuple
+import json
+import re
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
 from .config import ConfigManager
-from .database import EnhancedMemoryDB
+from .database import get_db
 from ..constants import OLLAMA_URL, DEFAULT_MODEL, MODEL_ROUTING
 
+MODELS_CACHE_TTL = 30.0
+
+CONTEXT_HEADER = "\nPrevious conversation context:"
+
+WORD_RE = re.compile(r"[a-z]+")
+
+CODE_KEYWORDS = frozenset({
+    'code', 'function', 'class', 'debug', 'algorithm', 'programming',
+    'syntax', 'bug', 'error', 'compile', 'refactor'
+})
+MATH_KEYWORDS = frozenset({'calculate', 'math', 'equation', 'formula', 'solve'})
+CREATIVE_KEYWORDS = frozenset({'write', 'story', 'creative', 'poem', 'narrative'})
 
 class AIInterface:
     """Interface for communicating with AI models via Ollama"""
 
+    _SYSTEM_PROMPTS = {
+        'mistral': "You are Sarek, a logical and helpful AI assistant named after Spock's father. Provide clear, technical explanations with Vulcan-like precision.",
+        'codellama': "You are Sarek, a code analysis expert. Provide detailed technical explanations of code, algorithms, and programming concepts.",
+        'llama2': "You are Sarek, a creative and analytical assistant. Help with both technical and creative tasks with logical precision."
+    }
+    _DEFAULT_SYSTEM_PROMPT = _SYSTEM_PROMPTS['mistral']
+
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
-        self.db = EnhancedMemoryDB()
+        self.db = get_db()
+        self._session = None
+        self._models_cache: Optional[Tuple[float, List[str]]] = None
+
+    @property
+    def session(self):
+        """Shared HTTP session so Ollama calls reuse one keep-alive connection"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.mount("http://localhost:11434", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+            session.headers["Connection"] = "keep-alive"
+            self._session = session
+        return self._session
 
     def auto_select_model(self, user_input: str, context: str = "") -> str:
         """Intelligently select the best model for the task"""
-        user_input_lower = user_input.lower()
+        # Whole-word matching, so e.g. 'classification' doesn't count as 'class'
+        tokens = set(WORD_RE.findall(user_input.lower()))
 
-        if any(word in user_input_lower for word in [
-            'code', 'function', 'class', 'debug', 'algorithm', 'programming',
-            'syntax', 'bug', 'error', 'compile', 'refactor'
-        ]):
+        if tokens & CODE_KEYWORDS:
             return MODEL_ROUTING.get('code_analysis', 'codellama')
 
-        elif any(word in user_input_lower for word in [
-            'calculate', 'math', 'equation', 'formula', 'solve'
-        ]):
+        elif tokens & MATH_KEYWORDS:
             return MODEL_ROUTING.get('math_problems', 'mistral')
 
-        elif any(word in user_input_lower for word in [
-            'write', 'story', 'creative', 'poem', 'narrative'
-        ]):
+        elif tokens & CREATIVE_KEYWORDS:
             return MODEL_ROUTING.get('creative_writing', 'llama2')
 
         return MODEL_ROUTING.get('general_chat', 'mistral')
@@ -49,75 +79,106 @@ class AIInterface:
             session_name, limit=self.config.get('context_limit', 3)
         )
 
-        system_prompts = {
-            'mistral': "You are Sarek, a logical and helpful AI assistant named after Spock's father. Provide clear, technical explanations with Vulcan-like precision.",
-            'codellama': "You are Sarek, a code analysis expert. Provide detailed technical explanations of code, algorithms, and programming concepts.",
-            'llama2': "You are Sarek, a creative and analytical assistant. Help with both technical and creative tasks with logical precision."
-        }
-
-        system_prompt = system_prompts.get(model, system_prompts['mistral'])
+        system_prompt = self._SYSTEM_PROMPTS.get(model, self._DEFAULT_SYSTEM_PROMPT)
 
         if not recent_conversations:
             return f"{system_prompt}\n\nUser: {user_input}\nAssistant:", ""
 
-        context_parts = [system_prompt, "\nPrevious conversation context:"]
-        for conv in recent_conversations:
-            context_parts.append(f"User: {conv.user_input}")
-            context_parts.append(f"Assistant: {conv.ai_response}")
-
-        context = "\n".join(context_parts)
+        context = "\n".join([
+            system_prompt,
+            CONTEXT_HEADER,
+            *(conv.rendered for conv in recent_conversations)
+        ])
         full_prompt = f"{context}\n\nCurrent question:\nUser: {user_input}\nAssistant:"
 
         return full_prompt, context
 
     def ask_model(self, prompt: str, model: str = None) -> str:
         """Query specified model via Ollama"""
+        return "".join(self.stream_model(prompt, model))
+
+    def stream_model(self, prompt: str, model: str = None) -> Iterator[str]:
+        """Query specified model via Ollama, yielding response tokens as they arrive"""
+        import requests
+
         if not model:
             model = self.config.get('default_model', DEFAULT_MODEL)
 
         try:
-            response = requests.post(
+            with self.session.post(
                 OLLAMA_URL,
                 json={
                     "model": model,
                     "prompt": prompt,
-                    "stream": False,
+                    "stream": True,
                     "options": {
                         "temperature": 0.7,
                         "top_p": 0.9,
                         "top_k": 40
                     }
                 },
-                timeout=120
-            )
-            response.raise_for_status()
-            return response.json()["response"]
+                stream=True,
+                timeout=(5, 120)
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        yield f"❌ Error querying model '{model}': {chunk['error']}"
+                        return
+                    yield chunk.get("response", "")
+                    if chunk.get("done"):
+                        return
 
         except requests.exceptions.Timeout:
-            return f"❌ Request timed out. Model '{model}' might be processing a large request."
+            yield f"❌ Request timed out. Model '{model}' might be processing a large request."
         except requests.exceptions.ConnectionError:
-            return f"❌ Cannot connect to Ollama. Make sure it's running with `ollama serve`"
+            yield f"❌ Cannot connect to Ollama. Make sure it's running with `ollama serve`"
         except requests.exceptions.HTTPError as e:
             if "404" in str(e):
-                return f"❌ Model '{model}' not found. Available models: {self.get_available_models()}"
-            return f"❌ HTTP error: {e}"
+                # The model may have been removed since the list was cached
+                self.invalidate_models()
+                yield f"❌ Model '{model}' not found. Available models: {self.get_available_models()}"
+            else:
+                yield f"❌ HTTP error: {e}"
         except Exception as e:
-            return f"❌ Error querying model '{model}': {e}"
+            yield f"❌ Error querying model '{model}': {e}"
 
     def get_available_models(self) -> List[str]:
         """Get list of available Ollama models"""
+        cache = self._models_cache
+        if cache and time.monotonic() - cache[0] < MODELS_CACHE_TTL:
+            return list(cache[1])
+
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=10)
+            response = self.session.get("http://localhost:11434/api/tags", timeout=10)
             if response.status_code == 200:
                 models = response.json().get('models', [])
-                return [model['name'].split(':')[0] for model in models]
+                names = [model['name'].split(':')[0] for model in models]
+                self._models_cache = (time.monotonic(), names)
+                return list(names)
         except Exception:
             pass
         return ['mistral', 'codellama', 'llama2']  # Default fallback
 
-    def query_with_context(self, session_name: str, user_input: str,
-                           model: str = None) -> Tuple[str, str]:
-        """Query AI with context and return response + context used"""
+    def invalidate_models(self) -> None:
+        """Forget the cached model list, so the next lookup asks Ollama again"""
+        self._models_cache = None
+
+    def query_with_context(self, session_name: str, user_input: str, model: str = None,
+                           on_token: Optional[Callable[[str], None]] = None) -> Tuple[str, str]:
+        """Query AI with context and return response + context used
+
+        If on_token is given it is called with each response token as it streams in.
+        """
         full_prompt, context = self.build_context_prompt(session_name, user_input, model)
-        response = self.ask_model(full_prompt, model)
-        return response, context
\ No newline at end of file
+        if on_token is None:
+            return self.ask_model(full_prompt, model), context
+
+        tokens = []
+        for token in self.stream_model(full_prompt, model):
+            tokens.append(token)
+            on_token(token)
+        return "".join(tokens), context
\ No newline at end of file
@@ -4,6 +4,7 @@ Configuration management for Sarek AI Assistant
 """
 
 import json
+import os
 from typing import Any, Dict
 from ..constants import CONFIG_PATH
 
@@ -40,9 +41,12 @@ class ConfigManager:
 
     def save_config(self) -> None:
         """Save configuration to file"""
+        # Write a sibling temp file and swap it in, so a failed write can't
+        # leave a truncated config behind
+        tmp_path = CONFIG_PATH.with_suffix('.json.tmp')
         try:
-            with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
+            tmp_path.write_text(json.dumps(self.config, separators=(',', ':')), encoding='utf-8')
+            os.replace(tmp_path, CONFIG_PATH)
         except Exception as e:
             print(f"Warning: Could not save config: {e}")
 
@@ -52,11 +56,15 @@ class ConfigManager:
 
     def set(self, key: str, value: Any) -> None:
         """Set configuration value and save"""
+        if key in self.config and self.config[key] == value:
+            return
         self.config[key] = value
         self.save_config()
 
     def update(self, updates: Dict[str, Any]) -> None:
         """Update multiple configuration values"""
+        if all(key in self.config and self.config[key] == value for key, value in updates.items()):
+            return
         self.config.update(updates)
         self.save_config()
 
@@ -3,12 +3,17 @@
 Data models for Sarek AI Assistant
 """
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional
 
+# slots=True drops the per-instance __dict__ on Python 3.10+; older
+# interpreters fall back to regular dataclasses
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Conversation:
     """Represents a conversation between user and AI"""
     id: int
@@ -19,8 +24,13 @@ class Conversation:
     context_used: str = ""
     model_used: str = "mistral"
 
+    @property
+    def rendered(self) -> str:
+        """This exchange as it appears in a context prompt"""
+        return f"User: {self.user_input}\nAssistant: {self.ai_response}"
+
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class CodeAnalysis:
     """Represents the result of code analysis"""
     file_path: str
@@ -34,7 +44,7 @@ class CodeAnalysis:
     security_issues: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Achievement:
     """Represents a user achievement/badge"""
     name: str
@@ -44,7 +54,7 @@ class Achievement:
     target: int = 100
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GitCommit:
     """Represents a git commit"""
     hash: str
@@ -54,7 +64,7 @@ class GitCommit:
     files_changed: int
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class SystemMetrics:
     """Represents system performance metrics"""
     cpu_usage: float
@@ -5,8 +5,10 @@ Database management for Sarek AI Assistant
 
 import sqlite3
 import json
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from rich.console import Console
 
 from .data_models import Conversation, Achievement
@@ -14,17 +16,182 @@ from ..constants import DB_PATH
 
 console = Console()
 
+# Per-connection tuning; journal_mode=WAL is persistent and set once in init_db
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Statements issued on every conversation turn; keeping the exact SQL text
+# constant lets sqlite3's statement cache reuse the compiled statements
+INSERT_CONVERSATION_SQL = """
+    INSERT INTO conversations (session_name, user_input, ai_response, context_used, model_used)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+UPSERT_SESSION_SQL = """
+    INSERT INTO sessions (name, last_used, message_count)
+    VALUES (?, CURRENT_TIMESTAMP, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        last_used = CURRENT_TIMESTAMP,
+        message_count = message_count + excluded.message_count
+"""
+
+RECENT_CONTEXT_SQL = """
+    SELECT id, session_name, timestamp, user_input, ai_response, context_used, model_used
+    FROM conversations
+    WHERE session_name = ?
+    ORDER BY timestamp DESC, id DESC LIMIT ?
+"""
+
+# One fixed statement per search variant instead of concatenating clauses per call
+_SEARCH_FTS_BASE = """
+    SELECT c.id, c.session_name, c.timestamp, c.user_input, c.ai_response,
+           c.context_used, c.model_used
+    FROM conversations_fts f
+    JOIN conversations c ON c.id = f.rowid
+    WHERE conversations_fts MATCH ?
+"""
+SEARCH_FTS_SQL = _SEARCH_FTS_BASE + " ORDER BY rank LIMIT 20"
+SEARCH_FTS_SESSION_SQL = _SEARCH_FTS_BASE + " AND c.session_name = ? ORDER BY rank LIMIT 20"
+
+_SEARCH_LIKE_BASE = """
+    SELECT id, session_name, timestamp, user_input, ai_response, context_used, model_used
+    FROM conversations
+    WHERE (user_input LIKE ? OR ai_response LIKE ?)
+"""
+SEARCH_LIKE_SQL = _SEARCH_LIKE_BASE + " ORDER BY timestamp DESC LIMIT 20"
+SEARCH_LIKE_SESSION_SQL = _SEARCH_LIKE_BASE + " AND session_name = ? ORDER BY timestamp DESC LIMIT 20"
+
+# A single UPSERT per achievement: create it if needed, count ?4 actions and
+# unlock it on reaching the target. Progress stops at the target, as it does
+# when counting one action at a time. RETURNING needs SQLite 3.35+.
+INCREMENT_ACHIEVEMENT_SQL = """
+    INSERT INTO achievements (name, target, description, progress, unlocked, unlocked_at)
+    VALUES (?1, ?2, ?3, MIN(?4, ?2), ?4 >= ?2, CASE WHEN ?4 >= ?2 THEN CURRENT_TIMESTAMP END)
+    ON CONFLICT(name) DO UPDATE SET
+        progress = MIN(progress + ?4, target),
+        unlocked = progress + ?4 >= target,
+        unlocked_at = CASE WHEN progress + ?4 >= target THEN CURRENT_TIMESTAMP ELSE unlocked_at END
+    WHERE unlocked = FALSE
+    RETURNING name, unlocked
+"""
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+ACHIEVEMENT_TARGETS = {
+    'conversation': [('chat_master', 100), ('session_expert', 10)],
+    'code_analysis': [('code_analyzer', 50), ('quality_guru', 25)],
+    'git_usage': [('git_ninja', 25), ('commit_master', 50)],
+    'learning': [('knowledge_seeker', 20), ('concept_master', 100)]
+}
+
+# All three table counts in one statement
+MEMORY_STATS_SQL = """
+    SELECT (SELECT COUNT(*) FROM conversations),
+           (SELECT COUNT(*) FROM sessions),
+           (SELECT COUNT(*) FROM code_analysis)
+"""
+
+# Bump whenever init_db or migrate_if_needed changes the schema
+SCHEMA_VERSION = 5
+
+
+def _conversation_row(cursor: sqlite3.Cursor, row: tuple) -> Conversation:
+    """Row factory for conversation queries, so fetchall() yields dataclasses directly"""
+    return Conversation(row[0], row[1], datetime.fromisoformat(row[2]), row[3], row[4], row[5],
+                        row[6] or "mistral")
+
+
+def _achievement_row(cursor: sqlite3.Cursor, row: tuple) -> Achievement:
+    """Row factory for achievement queries"""
+    return Achievement(row[0], row[1], bool(row[2]), row[3], row[4])
+
 
 class EnhancedMemoryDB:
     """Enhanced database with achievements and learning concepts"""
 
     def __init__(self):
-        self.init_db()
-        self.migrate_if_needed()
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+
+        # session_name -> (limit, conversations) from the last get_recent_context,
+        # valid while no other connection has committed (PRAGMA data_version)
+        self._recent_context: Dict[str, Tuple[int, List[Conversation]]] = {}
+        self._data_version: Optional[int] = None
+
+        # ((data_version, total_changes), counts) from the last get_memory_stats;
+        # the key moves whenever this or any other connection writes
+        self._memory_counts: Optional[Tuple[Tuple[int, int], Tuple[int, int, int]]] = None
+
+        # DDL and migrations only run when the on-disk schema is older than this code
+        if self._get_schema_version() < SCHEMA_VERSION:
+            self.init_db()
+            self.migrate_if_needed()
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        cursor = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations_fts'"
+        )
+        self.fts_enabled = cursor.fetchone() is not None
+
+    def _get_schema_version(self) -> int:
+        """Read the schema version recorded in the database header"""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    @staticmethod
+    def _init_pragmas(conn: sqlite3.Connection) -> None:
+        """Apply performance PRAGMAs to a freshly opened connection"""
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned, autocommit connection to the Sarek database"""
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        self._init_pragmas(conn)
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Long-lived connection shared by all queries of this instance"""
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared connection, checkpointing the WAL back into the database"""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a group of writes inside a single BEGIN IMMEDIATE/COMMIT
+
+        Nested use joins the enclosing transaction instead of starting another.
+        """
+        with self._lock:
+            # Holding the lock, an open transaction can only be this thread's own
+            if self._conn.in_transaction:
+                yield self._conn
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                # Includes KeyboardInterrupt: never leave the shared connection
+                # stuck inside an open transaction
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
 
     def init_db(self) -> None:
         """Initialize SQLite database with all required tables"""
-        with sqlite3.connect(DB_PATH) as conn:
+        # journal_mode cannot be changed inside a transaction
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        with self.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS conversations (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -42,9 +209,16 @@ class EnhancedMemoryDB:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     file_path TEXT UNIQUE NOT NULL,
                     file_hash TEXT NOT NULL,
+                    mtime_ns INTEGER,
+                    file_size INTEGER,
                     language TEXT,
                     lines_of_code INTEGER,
                     complexity_score REAL,
+                    functions TEXT,
+                    classes TEXT,
+                    imports TEXT,
+                    issues TEXT,
+                    security_issues TEXT,
                     analysis_data TEXT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
@@ -56,7 +230,8 @@ class EnhancedMemoryDB:
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                     last_used DATETIME DEFAULT CURRENT_TIMESTAMP,
                     description TEXT,
-                    mood TEXT DEFAULT 'neutral'
+                    mood TEXT DEFAULT 'neutral',
+                    message_count INTEGER DEFAULT 0
                 )
             """)
 
@@ -95,47 +270,183 @@ class EnhancedMemoryDB:
                 )
             """)
 
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS command_cache (
+                    cmd TEXT PRIMARY KEY,
+                    output TEXT NOT NULL,
+                    fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Matches RECENT_CONTEXT_SQL's ORDER BY exactly, so no sort step is needed
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_conv_session_recent
+                ON conversations (session_name, timestamp DESC, id DESC)
+            """)
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_code_file_hash
+                ON code_analysis (file_path, file_hash)
+            """)
+
+        self.init_fts()
+
+    def init_fts(self) -> bool:
+        """Create the FTS5 index over conversations; returns False if FTS5 is unavailable"""
+        try:
+            with self.transaction() as conn:
+                cursor = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations_fts'"
+                )
+                needs_backfill = cursor.fetchone() is None
+
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                        user_input, ai_response, session_name UNINDEXED,
+                        content='conversations', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS conversations_fts_insert AFTER INSERT ON conversations BEGIN
+                        INSERT INTO conversations_fts (rowid, user_input, ai_response, session_name)
+                        VALUES (new.id, new.user_input, new.ai_response, new.session_name);
+                    END
+                """)
+
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS conversations_fts_delete AFTER DELETE ON conversations BEGIN
+                        INSERT INTO conversations_fts (conversations_fts, rowid, user_input, ai_response, session_name)
+                        VALUES ('delete', old.id, old.user_input, old.ai_response, old.session_name);
+                    END
+                """)
+
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS conversations_fts_update AFTER UPDATE ON conversations BEGIN
+                        INSERT INTO conversations_fts (conversations_fts, rowid, user_input, ai_response, session_name)
+                        VALUES ('delete', old.id, old.user_input, old.ai_response, old.session_name);
+                        INSERT INTO conversations_fts (rowid, user_input, ai_response, session_name)
+                        VALUES (new.id, new.user_input, new.ai_response, new.session_name);
+                    END
+                """)
+
+                if needs_backfill:
+                    conn.execute("INSERT INTO conversations_fts (conversations_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 - search falls back to LIKE scans
+            return False
+
+        return True
+
     def migrate_if_needed(self) -> None:
         """Handle database migrations for schema changes"""
-        with sqlite3.connect(DB_PATH) as conn:
+        with self.transaction() as conn:
             cursor = conn.execute("PRAGMA table_info(conversations)")
             columns = [row[1] for row in cursor.fetchall()]
 
             if 'model_used' not in columns:
                 conn.execute("ALTER TABLE conversations ADD COLUMN model_used TEXT DEFAULT 'mistral'")
 
+            # Superseded by idx_conv_session_recent
+            conn.execute("DROP INDEX IF EXISTS idx_conv_session_ts")
+
+            cursor = conn.execute("PRAGMA table_info(code_analysis)")
+            columns = [row[1] for row in cursor.fetchall()]
+
+            if 'mtime_ns' not in columns:
+                conn.execute("ALTER TABLE code_analysis ADD COLUMN mtime_ns INTEGER")
+
+            if 'file_size' not in columns:
+                conn.execute("ALTER TABLE code_analysis ADD COLUMN file_size INTEGER")
+
+            for column in ('functions', 'classes', 'imports', 'issues', 'security_issues'):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE code_analysis ADD COLUMN {column} TEXT")
+
+            cursor = conn.execute("PRAGMA table_info(sessions)")
+            columns = [row[1] for row in cursor.fetchall()]
+
+            if 'message_count' not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN message_count INTEGER DEFAULT 0")
+                conn.execute("""
+                    UPDATE sessions SET message_count = (
+                        SELECT COUNT(*) FROM conversations c WHERE c.session_name = sessions.name
+                    )
+                """)
+
     def save_conversation(self, session_name: str, user_input: str, ai_response: str,
                           context: str = "", model: str = "mistral") -> None:
         """Save conversation and update achievements"""
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute("""
-                INSERT INTO conversations (session_name, user_input, ai_response, context_used, model_used)
-                VALUES (?, ?, ?, ?, ?)
-            """, (session_name, user_input, ai_response, context, model))
-
+        with self.transaction() as conn:
+            cursor = conn.execute(INSERT_CONVERSATION_SQL, (session_name, user_input, ai_response, context, model))
+            conn.execute(UPSERT_SESSION_SQL, (session_name, 1))
+            # Same transaction, so a conversation turn costs a single commit
+            self._increment_achievements(conn, ACHIEVEMENT_TARGETS['conversation'])
+
+        # Roll the cached context window forward instead of re-querying it next turn
+        cached = self._recent_context.get(session_name)
+        if cached:
+            limit, conversations = cached
+            conversations.append(Conversation(
+                id=cursor.lastrowid,
+                session_name=session_name,
+                timestamp=datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None),
+                user_input=user_input,
+                ai_response=ai_response,
+                context_used=context,
+                model_used=model
+            ))
+            del conversations[:-limit]
+
+    def get_cached_output(self, cmd: str, max_age_days: int = 7) -> Optional[str]:
+        """Return a previously cached command output if it is recent enough"""
+        cursor = self.conn.execute("""
+            SELECT output FROM command_cache
+            WHERE cmd = ? AND fetched_at > datetime('now', ?)
+        """, (cmd, f"-{max_age_days} days"))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def cache_output(self, cmd: str, output: str) -> None:
+        """Remember the output of an external command"""
+        with self.transaction() as conn:
             conn.execute("""
-                INSERT OR REPLACE INTO sessions (name, last_used)
-                VALUES (?, CURRENT_TIMESTAMP)
-            """, (session_name,))
-
-        self.update_achievements('conversation')
-
-    def update_achievements(self, action_type: str) -> None:
-        """Update achievement progress based on action type"""
-        achievements_to_check = {
-            'conversation': [('chat_master', 100), ('session_expert', 10)],
-            'code_analysis': [('code_analyzer', 50), ('quality_guru', 25)],
-            'git_usage': [('git_ninja', 25), ('commit_master', 50)],
-            'learning': [('knowledge_seeker', 20), ('concept_master', 100)]
-        }
+                INSERT OR REPLACE INTO command_cache (cmd, output, fetched_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            """, (cmd, output))
 
-        if action_type in achievements_to_check:
-            for achievement_name, target in achievements_to_check[action_type]:
-                self.increment_achievement(achievement_name, target)
+    def update_achievements(self, action_type: str, by: int = 1) -> None:
+        """Update achievement progress based on action type, counting `by` actions at once"""
+        if action_type in ACHIEVEMENT_TARGETS and by > 0:
+            with self.transaction() as conn:
+                self._increment_achievements(conn, ACHIEVEMENT_TARGETS[action_type], by)
 
     def increment_achievement(self, name: str, target: int) -> None:
         """Increment achievement progress and check for unlock"""
-        with sqlite3.connect(DB_PATH) as conn:
+        with self.transaction() as conn:
+            self._increment_achievements(conn, [(name, target)])
+
+    @staticmethod
+    def _increment_achievements(conn: sqlite3.Connection, achievements: List[Tuple[str, int]],
+                                by: int = 1) -> None:
+        """Bump (name, target) achievements by `by` inside the caller's transaction"""
+        if not HAS_RETURNING:
+            EnhancedMemoryDB._increment_achievements_legacy(conn, achievements, by)
+            return
+
+        for name, target in achievements:
+            # Only rows that were still locked get updated, so any row coming
+            # back unlocked has just been unlocked by this call
+            row = conn.execute(INCREMENT_ACHIEVEMENT_SQL, (name, target, f"Achievement: {name}", by)).fetchone()
+            if row and row[1]:
+                console.print(f"🏆 [bold yellow]Achievement Unlocked: {name}![/bold yellow]")
+
+    @staticmethod
+    def _increment_achievements_legacy(conn: sqlite3.Connection, achievements: List[Tuple[str, int]],
+                                       by: int = 1) -> None:
+        """Statement-per-step fallback for SQLite builds without RETURNING"""
+        for name, target in achievements:
             conn.execute("""
                 INSERT OR IGNORE INTO achievements (name, target, description)
                 VALUES (?, ?, ?)
@@ -143,9 +454,9 @@ class EnhancedMemoryDB:
 
             conn.execute("""
                 UPDATE achievements
-                SET progress = progress + 1
+                SET progress = MIN(progress + ?, target)
                 WHERE name = ? AND unlocked = FALSE
-            """, (name,))
+            """, (by, name))
 
             cursor = conn.execute("""
                 SELECT progress FROM achievements
@@ -163,118 +474,118 @@ class EnhancedMemoryDB:
 
     def get_recent_context(self, session_name: str, limit: int = 3) -> List[Conversation]:
         """Get recent conversations for context"""
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.execute("""
-                SELECT id, session_name, timestamp, user_input, ai_response, context_used, model_used
-                FROM conversations
-                WHERE session_name = ?
-                ORDER BY timestamp DESC LIMIT ?
-            """, (session_name, limit))
-
-            conversations = []
-            for row in cursor.fetchall():
-                conversations.append(Conversation(
-                    id=row[0],
-                    session_name=row[1],
-                    timestamp=datetime.fromisoformat(row[2]),
-                    user_input=row[3],
-                    ai_response=row[4],
-                    context_used=row[5],
-                    model_used=row[6] if row[6] else "mistral"
-                ))
-            return list(reversed(conversations))
+        conn = self.conn
+
+        # data_version only moves when another connection commits
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._recent_context.clear()
+            self._data_version = data_version
+
+        cached = self._recent_context.get(session_name)
+        if cached and cached[0] == limit:
+            return list(cached[1])
+
+        cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
+        conversations = cursor.execute(RECENT_CONTEXT_SQL, (session_name, limit)).fetchall()
+        conversations.reverse()
+
+        if limit > 0:
+            self._recent_context[session_name] = (limit, conversations)
+        return list(conversations)
 
     def search_conversations(self, query: str, session_name: Optional[str] = None) -> List[Conversation]:
         """Search conversation history"""
-        base_query = """
-            SELECT id, session_name, timestamp, user_input, ai_response, context_used, model_used
-            FROM conversations
-            WHERE (user_input LIKE ? OR ai_response LIKE ?)
-        """
-        params = [f"%{query}%", f"%{query}%"]
-
-        if session_name:
-            base_query += " AND session_name = ?"
-            params.append(session_name)
-
-        base_query += " ORDER BY timestamp DESC LIMIT 20"
-
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.execute(base_query, params)
-            conversations = []
-            for row in cursor.fetchall():
-                conversations.append(Conversation(
-                    id=row[0],
-                    session_name=row[1],
-                    timestamp=datetime.fromisoformat(row[2]),
-                    user_input=row[3],
-                    ai_response=row[4],
-                    context_used=row[5],
-                    model_used=row[6] if row[6] else "mistral"
-                ))
-            return conversations
+        if self.fts_enabled and query.strip():
+            params = [self._fts_query(query)]
+            sql = SEARCH_FTS_SQL
+            if session_name:
+                params.append(session_name)
+                sql = SEARCH_FTS_SESSION_SQL
+        else:
+            params = [f"%{query}%", f"%{query}%"]
+            sql = SEARCH_LIKE_SQL
+            if session_name:
+                params.append(session_name)
+                sql = SEARCH_LIKE_SESSION_SQL
+
+        conn = self.conn
+        cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
+        return cursor.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into an FTS5 expression of quoted prefix terms"""
+        terms = []
+        for term in query.split():
+            escaped = term.replace('"', '""')
+            terms.append(f'"{escaped}"*')
+        return " ".join(terms)
 
     def get_achievements(self) -> List[Achievement]:
         """Get all achievements"""
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.execute("""
-                SELECT name, description, unlocked, progress, target
-                FROM achievements
-                ORDER BY unlocked DESC, progress DESC
-            """)
-
-            achievements = []
-            for row in cursor.fetchall():
-                achievements.append(Achievement(
-                    name=row[0],
-                    description=row[1],
-                    unlocked=bool(row[2]),
-                    progress=row[3],
-                    target=row[4]
-                ))
-            return achievements
+        cursor = self.conn.cursor()
+        cursor.row_factory = _achievement_row
+        return cursor.execute("""
+            SELECT name, description, unlocked, progress, target
+            FROM achievements
+            ORDER BY unlocked DESC, progress DESC
+        """).fetchall()
 
     def get_sessions(self) -> List[Dict[str, Any]]:
         """Get all conversation sessions"""
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.execute("""
-                SELECT s.name, s.created_at, s.last_used, s.description,
-                       COUNT(c.id) as message_count
-                FROM sessions s
-                LEFT JOIN conversations c ON s.name = c.session_name
-                GROUP BY s.name, s.created_at, s.last_used, s.description
-                ORDER BY s.last_used DESC
-            """)
-
-            sessions = []
-            for row in cursor.fetchall():
-                sessions.append({
-                    'name': row[0],
-                    'created_at': row[1],
-                    'last_used': row[2],
-                    'description': row[3],
-                    'message_count': row[4]
-                })
-            return sessions
+        conn = self.conn
+        cursor = conn.execute("""
+            SELECT name, created_at, last_used, description, message_count
+            FROM sessions
+            ORDER BY last_used DESC
+        """)
+
+        sessions = []
+        for row in cursor.fetchall():
+            sessions.append({
+                'name': row[0],
+                'created_at': row[1],
+                'last_used': row[2],
+                'description': row[3],
+                'message_count': row[4]
+            })
+        return sessions
 
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get memory statistics from database"""
-        with sqlite3.connect(DB_PATH) as conn:
-
-            cursor = conn.execute("SELECT COUNT(*) FROM conversations")
-            total_conversations = cursor.fetchone()[0]
+        conn = self.conn
+
+        key = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        cached = self._memory_counts
+        if cached and cached[0] == key:
+            counts = cached[1]
+        else:
+            counts = conn.execute(MEMORY_STATS_SQL).fetchone()
+            self._memory_counts = (key, counts)
+        total_conversations, total_sessions, total_analyses = counts
+
+        db_size = DB_PATH.stat().st_size if DB_PATH.exists() else 0
+
+        return {
+            'conversations': total_conversations,
+            'sessions': total_sessions,
+            'code_analyses': total_analyses,
+            'database_size_mb': db_size / (1024 * 1024)
+        }
 
-            cursor = conn.execute("SELECT COUNT(*) FROM sessions")
-            total_sessions = cursor.fetchone()[0]
 
-            cursor = conn.execute("SELECT COUNT(*) FROM code_analysis")
-            total_analyses = cursor.fetchone()[0]
+_db_instance: Optional[EnhancedMemoryDB] = None
+_db_lock = threading.Lock()
 
-            db_size = DB_PATH.stat().st_size if DB_PATH.exists() else 0
 
-            return {
-                'conversations': total_conversations,
-                'sessions': total_sessions,
-                'code_analyses': total_analyses,
-                'database_size_mb': db_size / (1024 * 1024)
-            }
\ No newline at end of file
+def get_db() -> EnhancedMemoryDB:
+    """Return the process-wide EnhancedMemoryDB, creating it on first use"""
+    global _db_instance
+    if _db_instance is None:
+        with _db_lock:
+            if _db_instance is None:
+                _db_instance = EnhancedMemoryDB()
+    return _db_instance
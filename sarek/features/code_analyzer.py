@@ -8,51 +8,146 @@ import ast
 import re
 import json
 import hashlib
-import sqlite3
-from pathlib import Path
-from typing import Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from ..core.database import EnhancedMemoryDB
+from ..core.database import get_db
 from ..core.data_models import CodeAnalysis
-from ..constants import DB_PATH, SUPPORTED_EXTENSIONS
+from ..constants import SUPPORTED_EXTENSIONS
 
 console = Console()
 
+CACHE_LOOKUP_BATCH = 500
+ANALYSIS_MEMO_SIZE = 4096
+PARALLEL_MIN_FILES = 16
+PARALLEL_CHUNK_SIZE = 8
+PROGRESS_MIN_BYTES = 1 << 16
+
+BRANCH_NODES = (ast.If, ast.For, ast.While, ast.Try, ast.With)
+# match_case only exists on Python 3.10+
+STATEMENT_NODES = (ast.stmt, ast.excepthandler) + ((ast.match_case,) if hasattr(ast, 'match_case') else ())
+
+FUNCTION_RE = re.compile(r'function\s+(\w+)')
+CLASS_RE = re.compile(r'class\s+(\w+)')
+TODO_RE = re.compile(r'TODO|FIXME')
+TODO_ANY_CASE_RE = re.compile(r'todo|fixme', re.IGNORECASE)
+DEBUG_RE = re.compile(r'debug', re.IGNORECASE)
+JS_METHOD_RE = re.compile(r'(\w+)\s*:\s*function')
+JS_ARROW_RE = re.compile(r'const\s+(\w+)\s*=\s*\(.*?\)\s*=>')
+JS_IMPORT_RE = re.compile(r'import.*from\s+[\'"]([^\'"]+)[\'"]')
+
+STORE_ANALYSIS_SQL = """
+    INSERT OR REPLACE INTO code_analysis
+    (file_path, file_hash, mtime_ns, file_size, language, lines_of_code, complexity_score,
+     functions, classes, imports, issues, security_issues)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# The cached list columns only hold lists of strings, so a shared compact
+# encoder with the checks it doesn't need turned off is enough
+_to_json = json.JSONEncoder(separators=(',', ':'), check_circular=False).encode
+
+
+def _compile_security_rules(rules: List[Tuple[str, str]]) -> Tuple[list, list]:
+    """Compile lowercase (pattern, warning) rules two ways: with re.IGNORECASE for
+    arbitrary text, and plain for text that has already been lowercased"""
+    return (
+        [(re.compile(pattern, re.IGNORECASE), warning) for pattern, warning in rules],
+        [(re.compile(pattern), warning) for pattern, warning in rules]
+    )
+
+
+def ascii_lower(content: str) -> Optional[str]:
+    """Lowercased copy of content if it is pure ASCII, otherwise None
+
+    For ASCII text, case-sensitive matching against the lowercased copy is
+    equivalent to case-insensitive matching and several times faster.
+    """
+    return content.lower() if content.isascii() else None
+
+
+def find_security_issues(content: str, rules: Tuple[list, list], lowered: Optional[str] = None) -> List[str]:
+    """Return the warning of every rule that matches content, case-insensitively
+
+    lowered is content's ascii_lower() value, if the caller already has it.
+    """
+    if lowered is None:
+        lowered = ascii_lower(content)
+    if lowered is not None:
+        return [warning for pattern, warning in rules[1] if pattern.search(lowered)]
+    return [warning for pattern, warning in rules[0] if pattern.search(content)]
+
+
+# Patterns are written in lowercase; see find_security_issues
+PY_SECURITY_PATTERNS = _compile_security_rules([
+    (r'eval\s*\(', "🔴 Use of eval() - potential code injection"),
+    (r'exec\s*\(', "🔴 Use of exec() - potential code execution"),
+    (r'__import__\s*\(', "🟡 Dynamic imports - review for security"),
+    (r'shell=true', "🔴 Shell injection risk in subprocess"),
+    (r'sql.*%.*%', "🔴 Potential SQL injection"),
+    (r'pickle\.loads?\(', "🟡 Pickle usage - ensure trusted data only")
+])
+
+JS_SECURITY_PATTERNS = _compile_security_rules([
+    (r'eval\s*\(', "🔴 Use of eval() - code injection risk"),
+    (r'innerhtml\s*=', "🟡 innerHTML usage - XSS risk"),
+    (r'document\.write\s*\(', "🔴 document.write - XSS vulnerability"),
+    (r'\.html\s*\(.*\$', "🟡 Potential XSS in jQuery html()")
+])
+
+PHP_SECURITY_PATTERNS = _compile_security_rules([
+    (r'\$_get\[', "🟡 Direct $_GET usage - validate input"),
+    (r'\$_post\[', "🟡 Direct $_POST usage - validate input"),
+    (r'eval\s*\(', "🔴 Use of eval() - code injection"),
+    (r'exec\s*\(', "🔴 Use of exec() - command injection"),
+    (r'mysql_query\s*\(', "🔴 Deprecated mysql_query - use PDO"),
+    (r'md5\s*\(.*password', "🟡 MD5 for passwords - use stronger hashing")
+])
+
+
+def _scan_javascript(content: str) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """(functions, classes, imports, security_issues) found in JavaScript source"""
+    functions = FUNCTION_RE.findall(content)
+    functions.extend(JS_METHOD_RE.findall(content))
+    functions.extend(JS_ARROW_RE.findall(content))
+    return (functions, CLASS_RE.findall(content), JS_IMPORT_RE.findall(content),
+            find_security_issues(content, JS_SECURITY_PATTERNS))
+
+
+def _scan_php(content: str) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """(functions, classes, imports, security_issues) found in PHP source"""
+    return (FUNCTION_RE.findall(content), CLASS_RE.findall(content), [],
+            find_security_issues(content, PHP_SECURITY_PATTERNS))
+
+
+def _scan_plain(content: str) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """Languages without structural checks only get the shared line and TODO checks"""
+    return [], [], [], []
+
+
+# Language-specific structure and security scans used by analyze_generic_file
+LANGUAGE_SCANNERS = {
+    'javascript': _scan_javascript,
+    'php': _scan_php,
+}
+
 
 class AdvancedCodeAnalyzer:
     """Advanced code analysis with security checks and caching"""
 
     def __init__(self):
-        self.db = EnhancedMemoryDB()
+        self.db = get_db()
         self.supported_extensions = SUPPORTED_EXTENSIONS
+        # In-process copy of cache rows already read or written this session,
+        # in the same (file_hash, stat_key, analysis) shape _get_cached returns
+        self._memo: Dict[str, Tuple[str, Tuple[int, int], CodeAnalysis]] = {}
 
-    def get_file_hash(self, file_path: str) -> str:
-        """Generate hash of file content for caching"""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception:
-            return ""
-
-    def analyze_python_file(self, file_path: str) -> CodeAnalysis:
+    @staticmethod
+    def analyze_python_file(content: str, file_path: str) -> CodeAnalysis:
         """Enhanced Python analysis with security checks"""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception as e:
-            return CodeAnalysis(
-                file_path=file_path,
-                language="python",
-                lines_of_code=0,
-                complexity_score=0.0,
-                functions=[],
-                classes=[],
-                imports=[],
-                issues=[f"File read error: {e}"],
-                security_issues=[]
-            )
+        lines = content.splitlines()
 
         try:
             tree = ast.parse(content)
@@ -60,7 +155,7 @@ class AdvancedCodeAnalyzer:
             return CodeAnalysis(
                 file_path=file_path,
                 language="python",
-                lines_of_code=len(content.splitlines()),
+                lines_of_code=len(lines),
                 complexity_score=0.0,
                 functions=[],
                 classes=[],
@@ -73,13 +168,23 @@ class AdvancedCodeAnalyzer:
         classes = []
         imports = []
         complexity = 0
-        security_issues = []
 
-        for node in ast.walk(tree):
+        # Single breadth-first pass (same order as ast.walk). Each node carries the
+        # number of enclosing functions, so a branch adds one complexity point to
+        # every function it is nested in without re-walking each function body.
+        # Every node of interest is a statement, and expressions never contain
+        # statements, so expression subtrees are not queued at all.
+        queue = deque([(tree, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            child_depth = depth
+
             if isinstance(node, ast.FunctionDef):
                 functions.append(node.name)
-                complexity += sum(1 for n in ast.walk(node)
-                                  if isinstance(n, (ast.If, ast.For, ast.While, ast.Try, ast.With)))
+                child_depth = depth + 1
+
+            elif isinstance(node, BRANCH_NODES):
+                complexity += depth
 
             elif isinstance(node, ast.ClassDef):
                 classes.append(node.name)
@@ -91,21 +196,17 @@ class AdvancedCodeAnalyzer:
                 module = node.module or ""
                 imports.extend([f"{module}.{alias.name}" for alias in node.names])
 
-        security_patterns = [
-            (r'eval\s*\(', "🔴 Use of eval() - potential code injection"),
-            (r'exec\s*\(', "🔴 Use of exec() - potential code execution"),
-            (r'__import__\s*\(', "🟡 Dynamic imports - review for security"),
-            (r'shell=True', "🔴 Shell injection risk in subprocess"),
-            (r'sql.*%.*%', "🔴 Potential SQL injection"),
-            (r'pickle\.loads?\(', "🟡 Pickle usage - ensure trusted data only")
-        ]
-
-        for pattern, warning in security_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                security_issues.append(warning)
-
-        lines_of_code = len([line for line in content.splitlines()
-                             if line.strip() and not line.strip().startswith('#')])
+            queue.extend((child, child_depth) for child in ast.iter_child_nodes(node)
+                         if isinstance(child, STATEMENT_NODES))
+
+        lowered = ascii_lower(content)
+        security_issues = find_security_issues(content, PY_SECURITY_PATTERNS, lowered)
+
+        lines_of_code = 0
+        for line in lines:
+            stripped = line.strip()
+            if stripped and stripped[0] != '#':
+                lines_of_code += 1
         complexity_score = complexity / max(len(functions), 1)
 
         issues = []
@@ -118,13 +219,19 @@ class AdvancedCodeAnalyzer:
         if len(classes) > 10:
             issues.append("🟡 Many classes - consider design patterns")
 
-        content_lower = content.lower()
-        if 'todo' in content_lower or 'fixme' in content_lower:
+        # Plain substring checks on the shared lowercase copy where possible
+        if lowered is not None:
+            has_todo = 'todo' in lowered or 'fixme' in lowered
+        else:
+            has_todo = TODO_ANY_CASE_RE.search(content) is not None
+        if has_todo:
             issues.append("📝 Contains TODO/FIXME comments")
-        if content.count('except:') > 0:
+        if 'except:' in content:
             issues.append("⚠️ Bare except clauses - specify exception types")
-        if 'print(' in content and 'debug' not in content_lower:
-            issues.append("🟡 Print statements found - consider using logging")
+        if 'print(' in content:
+            has_debug = 'debug' in lowered if lowered is not None else DEBUG_RE.search(content) is not None
+            if not has_debug:
+                issues.append("🟡 Print statements found - consider using logging")
 
         return CodeAnalysis(
             file_path=file_path,
@@ -138,71 +245,19 @@ class AdvancedCodeAnalyzer:
             security_issues=security_issues
         )
 
-    def analyze_generic_file(self, file_path: str, language: str) -> CodeAnalysis:
+    @staticmethod
+    def analyze_generic_file(content: str, file_path: str, language: str) -> CodeAnalysis:
         """Basic analysis for non-Python files"""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception as e:
-            return CodeAnalysis(
-                file_path=file_path,
-                language=language,
-                lines_of_code=0,
-                complexity_score=0.0,
-                functions=[],
-                classes=[],
-                imports=[],
-                issues=[f"File read error: {e}"],
-                security_issues=[]
-            )
-
         lines = content.splitlines()
         lines_of_code = len([line for line in lines if line.strip()])
 
-        functions = []
-        classes = []
-        imports = []
-        issues = []
-        security_issues = []
-
-        if language == 'javascript':
-            functions = re.findall(r'function\s+(\w+)', content)
-            functions.extend(re.findall(r'(\w+)\s*:\s*function', content))
-            functions.extend(re.findall(r'const\s+(\w+)\s*=\s*\(.*?\)\s*=>', content))
-            classes = re.findall(r'class\s+(\w+)', content)
-            imports = re.findall(r'import.*from\s+[\'"]([^\'"]+)[\'"]', content)
-
-            js_security_patterns = [
-                (r'eval\s*\(', "🔴 Use of eval() - code injection risk"),
-                (r'innerHTML\s*=', "🟡 innerHTML usage - XSS risk"),
-                (r'document\.write\s*\(', "🔴 document.write - XSS vulnerability"),
-                (r'\.html\s*\(.*\$', "🟡 Potential XSS in jQuery html()")
-            ]
-
-            for pattern, warning in js_security_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    security_issues.append(warning)
-
-        elif language == 'php':
-            functions = re.findall(r'function\s+(\w+)', content)
-            classes = re.findall(r'class\s+(\w+)', content)
-
-            php_security_patterns = [
-                (r'\$_GET\[', "🟡 Direct $_GET usage - validate input"),
-                (r'\$_POST\[', "🟡 Direct $_POST usage - validate input"),
-                (r'eval\s*\(', "🔴 Use of eval() - code injection"),
-                (r'exec\s*\(', "🔴 Use of exec() - command injection"),
-                (r'mysql_query\s*\(', "🔴 Deprecated mysql_query - use PDO"),
-                (r'md5\s*\(.*password', "🟡 MD5 for passwords - use stronger hashing")
-            ]
-
-            for pattern, warning in php_security_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    security_issues.append(warning)
+        scan = LANGUAGE_SCANNERS.get(language, _scan_plain)
+        functions, classes, imports, security_issues = scan(content)
 
+        issues = []
         if lines_of_code > 500:
             issues.append("🟡 Large file - consider refactoring")
-        if content.count('TODO') + content.count('FIXME') > 0:
+        if TODO_RE.search(content):
             issues.append("📝 Contains TODO/FIXME comments")
 
         return CodeAnalysis(
@@ -217,67 +272,248 @@ class AdvancedCodeAnalyzer:
             security_issues=security_issues
         )
 
+    def iter_source_files(self, root: str, recursive: bool = True) -> Iterator[str]:
+        """Yield paths of supported source files under root
+
+        Uses os.scandir so the extension check happens on the directory entry
+        name, without a stat call for every unsupported file.
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in self.supported_extensions:
+                            yield entry.path
+            except OSError:
+                continue
+
+    def _get_cached(self, file_paths: List[str]) -> Dict[str, Tuple[str, Optional[Tuple[int, int]], Optional[CodeAnalysis]]]:
+        """Fetch cached (file_hash, (mtime_ns, size), analysis) entries for many files at once"""
+        cached = {path: self._memo[path] for path in file_paths if path in self._memo}
+        missing = [path for path in file_paths if path not in cached]
+
+        for start in range(0, len(missing), CACHE_LOOKUP_BATCH):
+            batch = missing[start:start + CACHE_LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            cursor = self.db.conn.execute(f"""
+                SELECT file_path, file_hash, mtime_ns, language, lines_of_code, complexity_score,
+                       functions, classes, imports, issues, security_issues, analysis_data, file_size
+                FROM code_analysis
+                WHERE file_path IN ({placeholders})
+            """, batch)
+            for row in cursor.fetchall():
+                entry = (row[1], (row[2], row[12]), self._decode_cached(row))
+                cached[row[0]] = entry
+                if entry[2] is not None:
+                    self._remember(row[0], entry)
+        return cached
+
+    def _remember(self, file_path: str, entry: Tuple[str, Tuple[int, int], CodeAnalysis]) -> None:
+        """Keep a cache row in memory; the memo is simply reset once it grows too large"""
+        if len(self._memo) >= ANALYSIS_MEMO_SIZE and file_path not in self._memo:
+            self._memo.clear()
+        self._memo[file_path] = entry
+
+    @staticmethod
+    def _decode_cached(row: Tuple) -> Optional[CodeAnalysis]:
+        """Rebuild a cached analysis from its row, or None if the stored data is unusable"""
+        try:
+            if row[6] is None:
+                # Rows written before the list columns existed
+                return CodeAnalysis(**json.loads(row[11]))
+
+            return CodeAnalysis(
+                file_path=row[0],
+                language=row[3],
+                lines_of_code=row[4],
+                complexity_score=row[5],
+                functions=json.loads(row[6]),
+                classes=json.loads(row[7]),
+                imports=json.loads(row[8]),
+                issues=json.loads(row[9]),
+                security_issues=json.loads(row[10])
+            )
+        except Exception:
+            return None
+
+    def _store_analyses(self, entries: List[Tuple[str, str, Tuple[int, int], CodeAnalysis]],
+                        fresh_count: int = 0) -> None:
+        """Cache (file_path, file_hash, (mtime_ns, size), analysis) entries in one transaction
+
+        fresh_count newly analyzed files are credited to the code_analysis
+        achievements in the same transaction.
+        """
+        if not entries:
+            return
+
+        for file_path, file_hash, stat_key, analysis in entries:
+            self._remember(file_path, (file_hash, stat_key, analysis))
+
+        try:
+            # Serialize before taking the write lock so it is held only for the inserts
+            rows = [
+                (
+                    file_path, file_hash, stat_key[0], stat_key[1], analysis.language, analysis.lines_of_code,
+                    analysis.complexity_score,
+                    _to_json(analysis.functions),
+                    _to_json(analysis.classes),
+                    _to_json(analysis.imports),
+                    _to_json(analysis.issues),
+                    _to_json(analysis.security_issues)
+                )
+                for file_path, file_hash, stat_key, analysis in entries
+            ]
+
+            with self.db.transaction() as conn:
+                conn.executemany(STORE_ANALYSIS_SQL, rows)
+                self.db.update_achievements('code_analysis', by=fresh_count)
+        except Exception:
+            pass
+
     def analyze_file_with_progress(self, file_path: str) -> Optional[CodeAnalysis]:
         """Analyze file with progress indication and caching"""
-        if not os.path.exists(file_path):
+        # One stat both checks existence and gives the cache key
+        try:
+            stat_key = _stat_key(file_path)
+        except OSError:
             return None
 
+        cached_hash, cached_key, cached = self._get_cached([file_path]).get(file_path, ("", None, None))
+
+        # An unchanged mtime and size means the cached row is still valid - skip reading
+        if cached and cached_key == stat_key:
+            return cached
+
+        # Small files finish faster than a spinner can start, so only show one
+        # when there is real work to wait for
+        if stat_key[1] < PROGRESS_MIN_BYTES:
+            return self._analyze_uncached(file_path, stat_key, cached_hash, cached)
+
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 console=console
         ) as progress:
-            task = progress.add_task("🔍 Analyzing file...", total=None)
+            progress.add_task("🧠 Analyzing code structure...", total=None)
+            return self._analyze_uncached(file_path, stat_key, cached_hash, cached)
+
+    def _analyze_uncached(self, file_path: str, stat_key: Tuple[int, int], cached_hash: str,
+                          cached: Optional[CodeAnalysis]) -> Optional[CodeAnalysis]:
+        """Analyze a file whose cache entry is missing or stale, and store the result"""
+        result = analyze_source(file_path, cached_hash if cached else "")
+        if result is None:
+            return None
+
+        file_hash, analysis = result
+
+        if analysis is None:
+            # Touched but unchanged - refresh the stored stat key only
+            self._store_analyses([(file_path, file_hash, stat_key, cached)])
+            return cached
+
+        self._store_analyses([(file_path, file_hash, stat_key, analysis)], fresh_count=1)
+
+        return analysis
+
+    def analyze_directory(self, file_paths: List[str],
+                          on_file: Optional[Callable[[str], None]] = None) -> List[CodeAnalysis]:
+        """Analyze many files, fanning cache misses out to worker processes"""
+        cached_entries = self._get_cached(file_paths)
+        analyses = {}
+        pending = []
+
+        for file_path in file_paths:
+            try:
+                stat_key = _stat_key(file_path)
+            except OSError:
+                if on_file:
+                    on_file(file_path)
+                continue
+
+            cached_hash, cached_key, cached = cached_entries.get(file_path, ("", None, None))
+            if cached and cached_key == stat_key:
+                analyses[file_path] = cached
+                if on_file:
+                    on_file(file_path)
+                continue
+
+            pending.append((file_path, stat_key, cached, cached_hash if cached else ""))
+
+        to_store = []
+        fresh_count = 0
+        for (file_path, stat_key, cached, _), result in zip(pending, self._map_sources(pending)):
+            if on_file:
+                on_file(file_path)
+            if result is None:
+                continue
+
+            file_hash, analysis = result
+            if analysis is None:
+                analysis = cached
+            else:
+                fresh_count += 1
 
-            file_hash = self.get_file_hash(file_path)
-            if not file_hash:
-                return None
+            analyses[file_path] = analysis
+            to_store.append((file_path, file_hash, stat_key, analysis))
 
-            progress.update(task, description="💾 Checking cache...")
+        self._store_analyses(to_store, fresh_count)
 
-            with sqlite3.connect(DB_PATH) as conn:
-                cursor = conn.execute("""
-                    SELECT analysis_data FROM code_analysis
-                    WHERE file_path = ? AND file_hash = ?
-                """, (file_path, file_hash))
+        return [analyses[file_path] for file_path in file_paths if file_path in analyses]
 
-                row = cursor.fetchone()
-                if row:
-                    progress.update(task, description="✅ Found cached analysis")
-                    try:
-                        data = json.loads(row[0])
-                        return CodeAnalysis(**data)
-                    except Exception:
-                        pass
+    @staticmethod
+    def _map_sources(pending: List[Tuple[str, Tuple[int, int], Optional[CodeAnalysis], str]]) -> Iterator:
+        """Run analyze_source over pending files, in worker processes for large batches"""
+        paths = [entry[0] for entry in pending]
+        hashes = [entry[3] for entry in pending]
 
-            progress.update(task, description="🧠 Analyzing code structure...")
+        if len(pending) < PARALLEL_MIN_FILES:
+            yield from map(analyze_source, paths, hashes)
+            return
 
-            ext = Path(file_path).suffix.lower()
-            language = self.supported_extensions.get(ext, 'unknown')
+        # Don't start more workers than there are chunks to hand out
+        chunks = -(-len(paths) // PARALLEL_CHUNK_SIZE)
+        workers = min(os.cpu_count() or 1, chunks)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(analyze_source, paths, hashes, chunksize=PARALLEL_CHUNK_SIZE)
+
+
+def _stat_key(file_path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) pair used to decide whether a cached analysis is still current"""
+    st = os.stat(file_path)
+    return st.st_mtime_ns, st.st_size
 
-            if language == 'python':
-                analysis = self.analyze_python_file(file_path)
-            else:
-                analysis = self.analyze_generic_file(file_path, language)
 
-            progress.update(task, description="💾 Caching results...")
+def analyze_source(file_path: str, cached_hash: str = "") -> Optional[Tuple[str, Optional[CodeAnalysis]]]:
+    """Hash and analyze a file without touching the cache; safe to run in a worker process
 
-            if analysis:
-                try:
-                    with sqlite3.connect(DB_PATH) as conn:
-                        conn.execute("""
-                            INSERT OR REPLACE INTO code_analysis 
-                            (file_path, file_hash, language, lines_of_code, complexity_score, analysis_data)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (
-                            file_path, file_hash, analysis.language, analysis.lines_of_code,
-                            analysis.complexity_score, json.dumps(analysis.__dict__, default=str)
-                        ))
-                except Exception:
-                    pass
+    Returns None if the file cannot be read, and (hash, None) when the content
+    still matches cached_hash.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
 
-            progress.update(task, description="✅ Analysis complete!")
+    file_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if file_hash == cached_hash:
+        return file_hash, None
 
-        self.db.update_achievements('code_analysis')
+    # Most source files are pure ASCII, which decodes without UTF-8 validation
+    if raw.isascii():
+        content = raw.decode('ascii')
+    else:
+        content = raw.decode('utf-8', errors='ignore')
+    language = SUPPORTED_EXTENSIONS.get(os.path.splitext(file_path)[1].lower(), 'unknown')
 
-        return analysis
\ No newline at end of file
+    if language == 'python':
+        return file_hash, AdvancedCodeAnalyzer.analyze_python_file(content, file_path)
+    return file_hash, AdvancedCodeAnalyzer.analyze_generic_file(content, file_path, language)
@@ -3,37 +3,120 @@
 Git integration for Sarek AI Assistant
 """
 
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-try:
-    import git
+from ..core.database import get_db
 
-    GIT_AVAILABLE = True
-except ImportError:
-    GIT_AVAILABLE = False
+# ASCII record/unit separators never appear in git's output fields, so a single
+# `git log` can be split into commits and fields without escaping
+RECORD_SEP = '\x1e'
+FIELD_SEP = '\x1f'
 
-from ..core.database import EnhancedMemoryDB
+# Rewrite the commit-graph at most once a day; git reads it automatically
+# (core.commitGraph defaults to true) to avoid inflating commits in log walks
+COMMIT_GRAPH_MAX_AGE = 24 * 60 * 60
+
+# get_status results are reused while the index and HEAD are untouched, for at
+# most STATUS_CACHE_TTL seconds so plain worktree edits still show up quickly.
+# Ahead/behind needs a network fetch and is refreshed far less often.
+STATUS_CACHE_TTL = 5.0
+AHEAD_BEHIND_TTL = 60.0
+
+# First git release with --diff-merges; older ones only have -m
+DIFF_MERGES_MIN_VERSION = (2, 31)
 
 
 class GitIntegration:
     """Git repository integration and analysis"""
 
-    def __init__(self):
-        self.db = EnhancedMemoryDB()
-        self.available = GIT_AVAILABLE
-        self.repo = None
+    def __init__(self, verbose: bool = False):
+        self.db = get_db()
+        self.verbose = verbose
+        self._status_cache: Optional[Tuple[Tuple[int, ...], float, Dict[str, Any]]] = None
+        self._ahead_behind_cache: Optional[Tuple[str, float, Dict[str, int]]] = None
+        self._head_memo: Tuple[Optional[str], Dict[Any, Any]] = (None, {})
+
+        # GitPython is imported and the repository located on first use
+        self._repo_lock = threading.Lock()
+        self._discovered = False
+        self._available = False
+        self._repo = None
+
+    @property
+    def available(self) -> bool:
+        """Whether GitPython is installed and the working directory is inside a repository"""
+        self._discover()
+        return self._available
+
+    @property
+    def repo(self):
+        """The enclosing git.Repo, or None if there isn't one"""
+        self._discover()
+        return self._repo
+
+    def _discover(self) -> None:
+        """Import GitPython and find the enclosing repository, once per instance"""
+        if self._discovered:
+            return
+
+        with self._repo_lock:
+            if self._discovered:
+                return
+
+            try:
+                import git
+            except ImportError:
+                git = None
+
+            if git is not None:
+                try:
+                    self._repo = git.Repo('.', search_parent_directories=True)
+                    self._available = True
+                    self._log(f"✅ Git repository found: {self._repo.working_dir}")
+                except git.exc.InvalidGitRepositoryError:
+                    self._log("❌ Not a git repository")
+                except Exception as e:
+                    self._log(f"❌ Git initialization error: {e}")
+
+            self._discovered = True
+
+        if self._available:
+            self._refresh_commit_graph()
+
+    def _log(self, message: str) -> None:
+        """Print discovery messages only when asked to"""
+        if self.verbose:
+            print(message)
+
+    def _has_diff_merges(self) -> bool:
+        """Whether the installed git understands --diff-merges"""
+        return tuple(self.repo.git.version_info[:2]) >= DIFF_MERGES_MIN_VERSION
+
+    def _refresh_commit_graph(self) -> None:
+        """Write the commit-graph in the background if it is missing or stale"""
+        info_dir = os.path.join(self.repo.common_dir, 'objects', 'info')
+        newest = 0.0
+        for name in ('commit-graph', os.path.join('commit-graphs', 'commit-graph-chain')):
+            try:
+                newest = max(newest, os.stat(os.path.join(info_dir, name)).st_mtime)
+            except OSError:
+                continue
+
+        if time.time() - newest < COMMIT_GRAPH_MAX_AGE:
+            return
 
-        if self.available:
+        def write():
             try:
-                self.repo = git.Repo('.', search_parent_directories=True)
-                print(f"✅ Git repository found: {self.repo.working_dir}")
-            except git.exc.InvalidGitRepositoryError:
-                print("❌ Not a git repository")
-                self.available = False
-            except Exception as e:
-                print(f"❌ Git initialization error: {e}")
-                self.available = False
+                self.repo.git.commit_graph('write', '--reachable', '--changed-paths')
+            except Exception:
+                # Older git or a read-only repository - log walks just stay slower
+                pass
+
+        threading.Thread(target=write, name='sarek-commit-graph', daemon=True).start()
 
     def get_status(self) -> Dict[str, Any]:
         """Get comprehensive git status"""
@@ -43,6 +126,11 @@ class GitIntegration:
         if not self.repo:
             return {'error': 'Git repository not initialized'}
 
+        key = self._status_key()
+        cached = self._status_cache
+        if cached and cached[0] == key and time.monotonic() - cached[1] < STATUS_CACHE_TTL:
+            return dict(cached[2])
+
         try:
             try:
                 current_branch = self.repo.active_branch.name
@@ -68,24 +156,55 @@ class GitIntegration:
                     'date': last_commit.committed_date
                 }
             }
-            return status
+            self._status_cache = (key, time.monotonic(), status)
+            return dict(status)
         except Exception as e:
             return {'error': f'Git status error: {e}'}
 
+    def _status_key(self) -> Tuple[int, ...]:
+        """mtimes of the files git rewrites on staging, commits, checkouts and resets"""
+        key = []
+        for name in ('index', 'HEAD', os.path.join('logs', 'HEAD')):
+            try:
+                key.append(os.stat(os.path.join(self.repo.git_dir, name)).st_mtime_ns)
+            except OSError:
+                key.append(0)
+        return tuple(key)
+
     def get_ahead_behind(self) -> Dict[str, int]:
         """Get ahead/behind commit count"""
+        try:
+            branch = self.repo.active_branch.name
+        except Exception:
+            return {'ahead': 0, 'behind': 0}
+
+        # Only go to the network once per AHEAD_BEHIND_TTL for the same branch
+        cached = self._ahead_behind_cache
+        if cached and cached[0] == branch and time.monotonic() - cached[1] < AHEAD_BEHIND_TTL:
+            return dict(cached[2])
+
         try:
             origin = self.repo.remotes.origin
-            origin.fetch()
+            # A fetch from any process (including the user's own) refreshes FETCH_HEAD
+            try:
+                fetch_age = time.time() - os.stat(os.path.join(self.repo.git_dir, 'FETCH_HEAD')).st_mtime
+            except OSError:
+                fetch_age = None
+            if fetch_age is None or fetch_age >= AHEAD_BEHIND_TTL:
+                origin.fetch()
             local = self.repo.head.commit
-            remote = origin.refs[self.repo.active_branch.name].commit
+            remote = origin.refs[branch].commit
 
-            ahead = list(self.repo.iter_commits(f'{remote}..{local}'))
-            behind = list(self.repo.iter_commits(f'{local}..{remote}'))
+            # Both counts from one rev-list, without loading any commit objects in Python
+            counts = self.repo.git.rev_list('--left-right', '--count', f'{local}...{remote}')
+            ahead, behind = (int(count) for count in counts.split())
 
-            return {'ahead': len(ahead), 'behind': len(behind)}
+            result = {'ahead': ahead, 'behind': behind}
         except Exception:
-            return {'ahead': 0, 'behind': 0}
+            result = {'ahead': 0, 'behind': 0}
+
+        self._ahead_behind_cache = (branch, time.monotonic(), result)
+        return dict(result)
 
     def get_recent_activity(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent git activity"""
@@ -93,52 +212,128 @@ class GitIntegration:
             return []
 
         try:
-            commits = list(self.repo.iter_commits(max_count=limit))
+            # Older git's -m repeats a merge once per parent, first parent first
+            merge_diff = '--diff-merges=first-parent' if self._has_diff_merges() else '-m'
+            # One git process for all commits, instead of a diff per commit for stats
+            records = self._log_records(
+                limit, FIELD_SEP.join(('%H', '%an', '%ct', '%B', '')),
+                '--numstat', '--no-renames', merge_diff
+            )
             activity = []
+            seen = set()
 
-            for commit in commits:
+            for record in records:
+                hexsha, author, committed_date, message, numstat = record.split(FIELD_SEP, 4)
+                if hexsha in seen:
+                    continue
+                seen.add(hexsha)
                 activity.append({
-                    'hash': commit.hexsha[:8],
-                    'message': commit.message.strip(),
-                    'author': str(commit.author),
-                    'date': datetime.fromtimestamp(commit.committed_date),
-                    'files_changed': len(commit.stats.files)
+                    'hash': hexsha[:8],
+                    'message': message.strip(),
+                    'author': author,
+                    'date': datetime.fromtimestamp(int(committed_date)),
+                    'files_changed': sum(1 for line in numstat.splitlines() if line)
                 })
 
             return activity
-        except Exception:
+        except Exception as e:
+            self._log(f"Could not read recent git activity: {e}")
             return []
 
+    def _for_head(self, name: Any, compute: Callable[[], Any]) -> Any:
+        """compute()'s result for the current HEAD commit, reused until HEAD moves
+
+        History and tree contents are fixed for a given commit id, so anything
+        derived only from them never goes stale while HEAD stays put.
+        """
+        head = self.repo.head.commit.hexsha
+        if self._head_memo[0] != head:
+            self._head_memo = (head, {})
+        values = self._head_memo[1]
+        if name not in values:
+            values[name] = compute()
+        return values[name]
+
+    def _log_records(self, limit: int, pretty: str, *args: str) -> List[str]:
+        """Run a single `git log` and split its output into one record per commit"""
+        output = self.repo.git.log(f'--pretty=format:{RECORD_SEP}{pretty}', f'--max-count={limit}', *args)
+        return output.split(RECORD_SEP)[1:]
+
+    def _tracked_blobs(self, with_size: bool = False) -> List[Tuple[str, int]]:
+        """(path, size) of every file in HEAD's tree, from one `git ls-tree`
+
+        Sizes are only looked up when with_size is set and are 0 otherwise.
+        """
+        return self._for_head(('blobs', with_size), lambda: self._list_blobs(with_size))
+
+    def _list_blobs(self, with_size: bool) -> List[Tuple[str, int]]:
+        """Uncached body of _tracked_blobs"""
+        args = ['-r', '-z', 'HEAD']
+        if with_size:
+            args.insert(0, '-l')
+        output = self.repo.git.ls_tree(*args)
+
+        blobs = []
+        for entry in output.split('\0'):
+            # "<mode> <type> <object>[ <size>]\t<path>"; submodules are type 'commit'
+            meta, _, path = entry.partition('\t')
+            fields = meta.split()
+            if len(fields) >= 3 and fields[1] == 'blob':
+                blobs.append((path, int(fields[3]) if with_size else 0))
+        return blobs
+
     def get_commit_info(self, commit_hash: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a specific commit"""
         if not self.available:
             return None
 
         try:
-            commit = self.repo.commit(commit_hash)
-
-            diffs = commit.diff(commit.parents[0] if commit.parents else None)
+            if self._has_diff_merges():
+                merge_diff = ('--diff-merges=first-parent',)
+            else:
+                merge_diff = ('-m', '--first-parent')
+            # Header, --raw change types and --numstat counts from one git process
+            output = self.repo.git.show(
+                commit_hash, '-z', '--raw', '--numstat', '--no-renames', *merge_diff,
+                '--format=' + FIELD_SEP.join(('%H', '%an', '%ct', '%B')) + RECORD_SEP
+            )
+            header, _, changes = output.partition(RECORD_SEP)
+            hexsha, author, committed_date, message = header.split(FIELD_SEP, 3)
 
             files_changed = []
-            for diff in diffs:
-                if diff.a_path:
+            totals = {'insertions': 0, 'deletions': 0, 'lines': 0, 'files': 0}
+            tokens = iter(changes.lstrip('\0\n').split('\0'))
+            for token in tokens:
+                if token.startswith(':'):
+                    # ":<old mode> <new mode> <old sha> <new sha> <status>" then the path
+                    change_type = token.split()[-1]
                     files_changed.append({
-                        'path': diff.a_path,
-                        'change_type': diff.change_type,
-                        'insertions': diff.new_file,
-                        'deletions': diff.deleted_file
+                        'path': next(tokens, ''),
+                        'change_type': change_type,
+                        'insertions': change_type == 'A',
+                        'deletions': change_type == 'D'
                     })
+                elif '\t' in token:
+                    # "<added>\t<deleted>\t<path>", with "-" for binary files
+                    added, deleted, _ = token.split('\t', 2)
+                    insertions = int(added) if added != '-' else 0
+                    deletions = int(deleted) if deleted != '-' else 0
+                    totals['insertions'] += insertions
+                    totals['deletions'] += deletions
+                    totals['lines'] += insertions + deletions
+                    totals['files'] += 1
 
             return {
-                'hash': commit.hexsha[:8],
-                'full_hash': commit.hexsha,
-                'message': commit.message.strip(),
-                'author': str(commit.author),
-                'date': datetime.fromtimestamp(commit.committed_date),
+                'hash': hexsha[:8],
+                'full_hash': hexsha,
+                'message': message.strip(),
+                'author': author,
+                'date': datetime.fromtimestamp(int(committed_date)),
                 'files_changed': files_changed,
-                'stats': commit.stats.total
+                'stats': totals
             }
-        except Exception:
+        except Exception as e:
+            self._log(f"Could not read commit {commit_hash}: {e}")
             return None
 
     def get_branch_info(self) -> Dict[str, Any]:
@@ -166,17 +361,18 @@ class GitIntegration:
             return {'error': 'Git not available'}
 
         try:
-            commits = list(self.repo.iter_commits(max_count=100))
-            authors = set(str(commit.author) for commit in commits)
+            commit_authors = self._for_head(
+                'authors', lambda: [record.strip() for record in self._log_records(100, '%an')]
+            )
+            authors = set(commit_authors)
 
             file_types = {}
-            for item in self.repo.tree().traverse():
-                if item.type == 'blob':  # It's a file
-                    ext = item.path.split('.')[-1] if '.' in item.path else 'no_ext'
-                    file_types[ext] = file_types.get(ext, 0) + 1
+            for path, _ in self._tracked_blobs():
+                ext = path.split('.')[-1] if '.' in path else 'no_ext'
+                file_types[ext] = file_types.get(ext, 0) + 1
 
             return {
-                'total_commits': len(commits),
+                'total_commits': len(commit_authors),
                 'total_authors': len(authors),
                 'authors': list(authors),
                 'file_types': file_types,
@@ -203,22 +399,23 @@ class GitIntegration:
                 health_check['issues'].append("Uncommitted changes detected")
                 health_check['recommendations'].append("Consider committing or stashing changes")
 
-            if self.repo.untracked_files:
-                health_check['issues'].append(f"{len(self.repo.untracked_files)} untracked files")
+            # untracked_files runs `git ls-files` on every access
+            untracked_files = self.repo.untracked_files
+            if untracked_files:
+                health_check['issues'].append(f"{len(untracked_files)} untracked files")
                 health_check['recommendations'].append("Add important files to git or update .gitignore")
 
             large_files = []
-            for item in self.repo.tree().traverse():
-                if item.type == 'blob' and item.size > 10 * 1024 * 1024:  # 10MB
-                    large_files.append(item.path)
+            for path, size in self._tracked_blobs(with_size=True):
+                if size > 10 * 1024 * 1024:  # 10MB
+                    large_files.append(path)
 
             if large_files:
                 health_check['issues'].append(f"Large files detected: {len(large_files)}")
                 health_check['recommendations'].append("Consider using Git LFS for large files")
 
-            recent_commits = list(self.repo.iter_commits(max_count=5))
-            if recent_commits:
-                last_commit_date = datetime.fromtimestamp(recent_commits[0].committed_date)
+            if self.repo.head.is_valid():
+                last_commit_date = datetime.fromtimestamp(self.repo.head.commit.committed_date)
                 days_since_commit = (datetime.now() - last_commit_date).days
 
                 if days_since_commit > 30:
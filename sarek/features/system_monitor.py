@@ -3,9 +3,11 @@
 System monitoring for Sarek AI Assistant
 """
 
-import sqlite3
+import heapq
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 try:
@@ -15,7 +17,54 @@ try:
 except ImportError:
     SYSTEM_MONITORING = False
 
-from ..constants import DB_PATH
+from ..core.database import get_db
+
+CPU_SAMPLE_INTERVAL = 1.0
+
+# Back-to-back callers (dashboard, health assessment, suggestions) share one
+# set of psutil readings taken within this many seconds
+SNAPSHOT_TTL = 0.5
+
+
+class _CpuSampler:
+    """Measures CPU usage over back-to-back one-second windows on a daemon thread
+
+    Readers get the latest completed window immediately instead of each
+    blocking for a second inside psutil.cpu_percent(interval=1).
+    """
+
+    def __init__(self):
+        self.percent = 0.0
+        self.ready = threading.Event()
+        threading.Thread(target=self._run, name='sarek-cpu-sampler', daemon=True).start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                self.percent = psutil.cpu_percent(interval=CPU_SAMPLE_INTERVAL)
+                self.ready.set()
+        finally:
+            # Never leave readers waiting on a sampler that died
+            self.ready.set()
+
+    def current(self) -> float:
+        """Latest CPU usage, waiting for the first window to finish if needed"""
+        self.ready.wait(CPU_SAMPLE_INTERVAL * 2)
+        return self.percent
+
+
+_cpu_sampler: Optional[_CpuSampler] = None
+_cpu_sampler_lock = threading.Lock()
+
+
+def get_cpu_sampler() -> _CpuSampler:
+    """Return the process-wide CPU sampler, starting it on first use"""
+    global _cpu_sampler
+    if _cpu_sampler is None:
+        with _cpu_sampler_lock:
+            if _cpu_sampler is None:
+                _cpu_sampler = _CpuSampler()
+    return _cpu_sampler
 
 
 class SystemMonitor:
@@ -23,6 +72,9 @@ class SystemMonitor:
 
     def __init__(self):
         self.available = SYSTEM_MONITORING
+        self._cores: Optional[tuple] = None
+        self._boot_time: Optional[datetime] = None
+        self._snapshot_cache: Optional[Tuple[float, Dict[str, Any]]] = None
 
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get comprehensive system metrics"""
@@ -30,22 +82,19 @@ class SystemMonitor:
             return {'error': 'System monitoring not available (install psutil)'}
 
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_freq = psutil.cpu_freq()
-
-            memory = psutil.virtual_memory()
-
-            disk = psutil.disk_usage('/')
-
-            process_count = len(psutil.pids())
-
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            snapshot = self._snapshot()
+            cpu_percent = snapshot['cpu_percent']
+            cpu_freq = snapshot['cpu_freq']
+            memory = snapshot['memory']
+            disk = snapshot['disk']
+            process_count = snapshot['processes']
+            boot_time = self._boot_time
 
             return {
                 'cpu': {
                     'usage_percent': round(cpu_percent, 1),
-                    'cores_logical': psutil.cpu_count(logical=True),
-                    'cores_physical': psutil.cpu_count(logical=False),
+                    'cores_logical': self._cores[0],
+                    'cores_physical': self._cores[1],
                     'frequency_mhz': round(cpu_freq.current, 1) if cpu_freq else 0
                 },
                 'memory': {
@@ -69,6 +118,28 @@ class SystemMonitor:
         except Exception as e:
             return {'error': f'System monitoring error: {e}'}
 
+    def _snapshot(self) -> Dict[str, Any]:
+        """Raw psutil readings, reused for SNAPSHOT_TTL seconds"""
+        cached = self._snapshot_cache
+        now = time.monotonic()
+        if cached and now - cached[0] < SNAPSHOT_TTL:
+            return cached[1]
+
+        # Core counts and boot time are fixed for the life of the process
+        if self._cores is None:
+            self._cores = (psutil.cpu_count(logical=True), psutil.cpu_count(logical=False))
+            self._boot_time = datetime.fromtimestamp(psutil.boot_time())
+
+        snapshot = {
+            'cpu_percent': get_cpu_sampler().current(),
+            'cpu_freq': psutil.cpu_freq(),
+            'memory': psutil.virtual_memory(),
+            'disk': psutil.disk_usage('/'),
+            'processes': len(psutil.pids())
+        }
+        self._snapshot_cache = (time.monotonic(), snapshot)
+        return snapshot
+
     def get_health_assessment(self) -> Dict[str, Any]:
         """Assess system health and provide recommendations"""
         metrics = self.get_system_metrics()
@@ -137,21 +208,20 @@ class SystemMonitor:
             return []
 
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    pinfo = proc.info
-                    processes.append({
-                        'pid': pinfo['pid'],
-                        'name': pinfo['name'],
-                        'cpu_percent': round(pinfo['cpu_percent'], 1),
-                        'memory_percent': round(pinfo['memory_percent'], 1)
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-            return processes[:limit]
+            # Keep only the top entries while streaming, instead of building and
+            # sorting a dict for every process. Values psutil could not read
+            # (access denied, process gone) come back as None.
+            top = heapq.nlargest(
+                limit,
+                psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']),
+                key=lambda proc: proc.info['cpu_percent'] or 0.0
+            )
+            return [{
+                'pid': proc.info['pid'],
+                'name': proc.info['name'],
+                'cpu_percent': round(proc.info['cpu_percent'] or 0.0, 1),
+                'memory_percent': round(proc.info['memory_percent'] or 0.0, 1)
+            } for proc in top]
 
         except Exception:
             return []
@@ -193,19 +263,9 @@ class SystemMonitor:
         stats = {}
 
         try:
-            with sqlite3.connect(DB_PATH) as conn:
-
-                cursor = conn.execute("SELECT COUNT(*) FROM conversations")
-                stats['conversations'] = cursor.fetchone()[0]
-
-                cursor = conn.execute("SELECT COUNT(*) FROM sessions")
-                stats['sessions'] = cursor.fetchone()[0]
-
-                cursor = conn.execute("SELECT COUNT(*) FROM code_analysis")
-                stats['code_analyses'] = cursor.fetchone()[0]
-
-                db_size = DB_PATH.stat().st_size if DB_PATH.exists() else 0
-                stats['database_size_mb'] = round(db_size / (1024 * 1024), 2)
+            # Counts come from one statement, reused until the database changes
+            stats.update(get_db().get_memory_stats())
+            stats['database_size_mb'] = round(stats['database_size_mb'], 2)
 
         except Exception:
             stats.update({
@@ -217,7 +277,7 @@ class SystemMonitor:
 
         if self.available:
             try:
-                memory = psutil.virtual_memory()
+                memory = self._snapshot()['memory']
                 stats.update({
                     'system_memory_total_gb': round(memory.total / (1024 ** 3), 2),
                     'system_memory_used_gb': round(memory.used / (1024 ** 3), 2),
@@ -3,8 +3,11 @@
 Voice interface for Sarek AI Assistant
 """
 
+import queue
 import re
-from typing import Optional
+import threading
+import time
+from typing import Optional, Tuple
 from rich.console import Console
 
 try:
@@ -17,6 +20,34 @@ except ImportError:
 
 console = Console()
 
+# Opening the microphone to probe it is slow, so the answer is reused briefly
+MICROPHONE_PROBE_TTL = 30.0
+
+# Upper bound on a single request to the speech recognition service
+RECOGNITION_TIMEOUT = 10.0
+
+BRACKET_RE = re.compile(r'\[.*?\]')
+EMOJI_RE = re.compile(r'[🖖🤖📝💬🔍⚠️❌✅🔴🟡🟢📊🏆🎤🔊]')
+CODE_BLOCK_RE = re.compile(r'```.*?```', re.DOTALL)
+MARKUP_RE = re.compile(r'[*`]')
+
+SPOKEN_ABBREVIATIONS = {
+    'CLI': 'command line interface',
+    'API': 'A P I',
+    'URL': 'U R L',
+    'HTTP': 'H T T P',
+    'JSON': 'J S O N',
+    'XML': 'X M L',
+    'SQL': 'S Q L',
+    'CSS': 'C S S',
+    'HTML': 'H T M L',
+    'JS': 'JavaScript',
+    'TS': 'TypeScript'
+}
+# One pass for every abbreviation; JSON is listed before JS so it wins, and like
+# the str.replace chain this replaced, matches are not limited to whole words
+ABBREVIATION_RE = re.compile('|'.join(SPOKEN_ABBREVIATIONS))
+
 
 class VoiceInterface:
     """Voice recognition and text-to-speech interface"""
@@ -25,10 +56,20 @@ class VoiceInterface:
         self.available = VOICE_AVAILABLE
         self.recognizer = None
         self.tts = None
+        self._voices: Optional[list] = None
+        self._microphone_probe: Optional[Tuple[float, bool]] = None
+
+        # speak() hands text to a worker thread that owns the TTS engine, so the
+        # caller can carry on while the response is being read out
+        self._speech_queue: "queue.Queue[str]" = queue.Queue()
+        self._speech_pending = 0
+        self._speech_done = threading.Condition()
+        self._speech_worker: Optional[threading.Thread] = None
 
         if self.available:
             try:
                 self.recognizer = sr.Recognizer()
+                self.recognizer.operation_timeout = RECOGNITION_TIMEOUT
                 self.tts = pyttsx3.init()
                 self._configure_tts()
             except Exception:
@@ -40,7 +81,7 @@ class VoiceInterface:
             return
 
         try:
-            voices = self.tts.getProperty('voices')
+            voices = self._get_voices()
             if voices:
                 self.tts.setProperty('voice', voices[0].id)
 
@@ -56,6 +97,9 @@ class VoiceInterface:
             console.print("Install with: pip install SpeechRecognition pyttsx3")
             return None
 
+        # Don't let the microphone pick up our own reply
+        self.flush_speech()
+
         try:
             with sr.Microphone() as source:
                 console.print("🎤 [bold cyan]Listening... (speak now)[/bold cyan]")
@@ -88,56 +132,57 @@ class VoiceInterface:
             return None
 
     def speak(self, text: str) -> None:
-        """Speak the response with text-to-speech"""
+        """Speak the response with text-to-speech, without waiting for it to finish"""
         if not self.available or not self.tts:
             return
 
-        try:
-            clean_text = self._clean_text_for_speech(text)
-
-            if not clean_text.strip():
-                return
-
-            console.print("🔊 [dim]Speaking...[/dim]")
-
-            self.tts.say(clean_text)
-            self.tts.runAndWait()
-
-        except Exception as e:
-            console.print(f"❌ Text-to-speech error: {e}")
-
-    def _clean_text_for_speech(self, text: str) -> str:
-        """Clean text to make it more suitable for speech synthesis"""
+        clean_text = self._clean_text_for_speech(text)
 
-        clean_text = re.sub(r'\[.*?\]', '', text)
+        if not clean_text.strip():
+            return
 
-        clean_text = re.sub(r'[🖖🤖📝💬🔍⚠️❌✅🔴🟡🟢📊🏆🎤🔊]', '', clean_text)
+        console.print("🔊 [dim]Speaking...[/dim]")
 
-        clean_text = re.sub(r'```.*?```', '[code block]', clean_text, flags=re.DOTALL)
+        with self._speech_done:
+            self._speech_pending += 1
+            if self._speech_worker is None:
+                self._speech_worker = threading.Thread(
+                    target=self._run_speech_worker, name='sarek-tts', daemon=True
+                )
+                self._speech_worker.start()
+        self._speech_queue.put(clean_text)
 
-        clean_text = clean_text.replace('**', '').replace('*', '')
-        clean_text = clean_text.replace('`', '')
+    def flush_speech(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything passed to speak() has been spoken
 
-        replacements = {
-            'CLI': 'command line interface',
-            'API': 'A P I',
-            'URL': 'U R L',
-            'HTTP': 'H T T P',
-            'JSON': 'J S O N',
-            'XML': 'X M L',
-            'SQL': 'S Q L',
-            'CSS': 'C S S',
-            'HTML': 'H T M L',
-            'JS': 'JavaScript',
-            'TS': 'TypeScript'
-        }
+        Returns False if the timeout expired first.
+        """
+        with self._speech_done:
+            return self._speech_done.wait_for(lambda: self._speech_pending == 0, timeout)
 
-        for abbrev, replacement in replacements.items():
-            clean_text = clean_text.replace(abbrev, replacement)
+    def _run_speech_worker(self) -> None:
+        """Speak queued text one item at a time; all engine calls happen here"""
+        while True:
+            text = self._speech_queue.get()
+            try:
+                self.tts.say(text)
+                self.tts.runAndWait()
+            except Exception as e:
+                console.print(f"❌ Text-to-speech error: {e}")
+            finally:
+                with self._speech_done:
+                    self._speech_pending -= 1
+                    self._speech_done.notify_all()
 
-        clean_text = ' '.join(clean_text.split())
+    def _clean_text_for_speech(self, text: str) -> str:
+        """Clean text to make it more suitable for speech synthesis"""
+        clean_text = BRACKET_RE.sub('', text)
+        clean_text = EMOJI_RE.sub('', clean_text)
+        clean_text = CODE_BLOCK_RE.sub('[code block]', clean_text)
+        clean_text = MARKUP_RE.sub('', clean_text)
+        clean_text = ABBREVIATION_RE.sub(lambda match: SPOKEN_ABBREVIATIONS[match.group()], clean_text)
 
-        return clean_text
+        return ' '.join(clean_text.split())
 
     def set_voice_properties(self, rate: int = None, volume: float = None) -> None:
         """Set voice properties for TTS"""
@@ -160,7 +205,7 @@ class VoiceInterface:
             return []
 
         try:
-            voices = self.tts.getProperty('voices')
+            voices = self._get_voices()
             if voices:
                 return [
                     {
@@ -175,13 +220,19 @@ class VoiceInterface:
 
         return []
 
+    def _get_voices(self) -> list:
+        """TTS voices, enumerated from the engine once and then reused"""
+        if self._voices is None:
+            self._voices = list(self.tts.getProperty('voices') or [])
+        return self._voices
+
     def set_voice(self, voice_id: str) -> bool:
         """Set the TTS voice by ID"""
         if not self.available or not self.tts:
             return False
 
         try:
-            voices = self.tts.getProperty('voices')
+            voices = self._get_voices()
             if voices:
                 for voice in voices:
                     if voice.id == voice_id:
@@ -216,9 +267,16 @@ class VoiceInterface:
         if not self.available:
             return False
 
+        probe = self._microphone_probe
+        if probe and time.monotonic() - probe[0] < MICROPHONE_PROBE_TTL:
+            return probe[1]
+
         try:
             with sr.Microphone() as source:
                 self.recognizer.adjust_for_ambient_noise(source, duration=0.1)
-                return True
+                result = True
         except Exception:
-            return False
\ No newline at end of file
+            result = False
+
+        self._microphone_probe = (time.monotonic(), result)
+        return result
\ No newline at end of file
@@ -3,24 +3,20 @@
 Main entry point for Sarek AI Assistant
 """
 
+import os
+import stat
 import sys
+import time
 import argparse
-from typing import List
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.prompt import Prompt, Confirm
 
 from .core.config import ConfigManager
-from .core.database import EnhancedMemoryDB
+from .core.database import get_db
 from .core.ai_interface import AIInterface
 
-from .features.code_analyzer import AdvancedCodeAnalyzer
-from .features.git_integration import GitIntegration
-from .features.voice_interface import VoiceInterface
-from .features.system_monitor import SystemMonitor
-
-from .ui.dashboard import Dashboard, AchievementDisplay
+from .ui.dashboard import AchievementDisplay
 from .ui.commands import (
     CommandInterface, CodeDisplayHelper, SystemDisplayHelper,
     SessionDisplayHelper, ModelDisplayHelper
@@ -28,23 +24,60 @@ from .ui.commands import (
 
 from .constants import SMART_ALIASES
 
+if TYPE_CHECKING:
+    from .features.code_analyzer import AdvancedCodeAnalyzer
+    from .features.git_integration import GitIntegration
+    from .features.voice_interface import VoiceInterface
+    from .features.system_monitor import SystemMonitor
+    from .ui.dashboard import Dashboard
+
 console = Console()
 
+# Streamed answers are re-rendered at most this often; Markdown re-parses the
+# whole text on every render, so updating per token would be quadratic
+STREAM_REFRESH_PER_SECOND = 8
+
+# Longest we wait at exit for queued speech, in case the TTS engine stalls
+SPEECH_FLUSH_TIMEOUT = 5
+
 
 class SarekApplication:
     """Main Sarek application class"""
 
     def __init__(self):
         self.config = ConfigManager()
-        self.db = EnhancedMemoryDB()
+        self.db = get_db()
         self.ai = AIInterface(self.config)
-
-        self.code_analyzer = AdvancedCodeAnalyzer()
-        self.git_integration = GitIntegration()
-        self.voice_interface = VoiceInterface()
-        self.system_monitor = SystemMonitor()
-
-        self.dashboard = Dashboard(
+        # Set on Ctrl-C, so exit doesn't wait for pending speech
+        self.interrupted = False
+
+    # Feature components pull in GitPython, psutil, speech libraries etc., so
+    # they are only imported and constructed once a command needs them
+
+    @cached_property
+    def code_analyzer(self) -> "AdvancedCodeAnalyzer":
+        from .features.code_analyzer import AdvancedCodeAnalyzer
+        return AdvancedCodeAnalyzer()
+
+    @cached_property
+    def git_integration(self) -> "GitIntegration":
+        from .features.git_integration import GitIntegration
+        return GitIntegration()
+
+    @cached_property
+    def voice_interface(self) -> "VoiceInterface":
+        from .features.voice_interface import VoiceInterface
+        return VoiceInterface()
+
+    @cached_property
+    def system_monitor(self) -> "SystemMonitor":
+        from .features.system_monitor import SystemMonitor
+        return SystemMonitor()
+
+    @cached_property
+    def dashboard(self) -> "Dashboard":
+        from .ui.dashboard import Dashboard
+        return Dashboard(
             self.config, self.db, self.system_monitor, self.git_integration
         )
 
@@ -78,6 +111,8 @@ class SarekApplication:
 
     def _run_interactive_mode(self, session_name: str, args: argparse.Namespace) -> None:
         """Run interactive mode with command palette"""
+        from rich.prompt import Prompt
+
         try:
             while True:
                 console.print("\n🖖 [bold cyan]Sarek Interactive Mode[/bold cyan]")
@@ -92,20 +127,32 @@ class SarekApplication:
                 else:
                     user_input = Prompt.ask(f"[{session_name}] 🖖", default="")
 
-                if user_input.lower() in ['exit', 'quit', 'bye']:
+                head, _, rest = user_input.partition(' ')
+                command = head.lower()
+                command = SMART_ALIASES.get(command, command)
+
+                if command in ('exit', 'quit', 'bye') and not rest:
                     console.print("👋 [bold]Live long and prosper![/bold]")
                     break
-                elif user_input.lower() == 'palette':
-                    command = CommandInterface.show_command_palette()
-                    self._process_command(command, [], session_name, args)
-                elif user_input.lower() == 'help':
-                    CommandInterface.show_enhanced_help()
+                elif self._is_interactive_command(command, rest):
+                    self._process_command(command, rest.split(), session_name, args)
                 elif user_input:
                     self._process_query(user_input, session_name, args)
 
         except KeyboardInterrupt:
+            self.interrupted = True
             console.print("\n👋 Interrupted. Goodbye!")
 
+    # Commands that take arguments; any other command word only counts as a
+    # command when typed on its own, so "help me with..." stays a question
+    _ARG_COMMANDS = frozenset({"analyze", "analyze-dir", "explain-code", "search"})
+
+    def _is_interactive_command(self, command: str, rest: str) -> bool:
+        """Whether an interactive line starting with command should run it rather than query the AI"""
+        if command.startswith("git-") or command in self._ARG_COMMANDS:
+            return True
+        return command in self._COMMAND_HANDLERS and not rest.strip()
+
     def _run_command_mode(self, command_list: List[str], session_name: str, args: argparse.Namespace) -> None:
         """Run single command mode"""
         command = command_list[0].lower() if command_list else ""
@@ -119,74 +166,100 @@ class SarekApplication:
     def _process_command(self, command: str, command_args: List[str], session_name: str,
                          args: argparse.Namespace) -> None:
         """Process specific commands"""
+        handler = self._COMMAND_HANDLERS.get(command)
+        if handler is None:
+            handler = SarekApplication._cmd_git if command.startswith("git") else SarekApplication._cmd_query
+        handler(self, command, command_args, session_name, args)
 
-        if command == "help":
-            CommandInterface.show_enhanced_help()
+    # Command handlers, all taking (command, command_args, session_name, args)
+    # so _process_command can dispatch through _COMMAND_HANDLERS
 
-        elif command == "palette":
-            new_command = CommandInterface.show_command_palette()
-            self._process_command(new_command, [], session_name, args)
+    def _cmd_help(self, command, command_args, session_name, args) -> None:
+        CommandInterface.show_enhanced_help()
+
+    def _cmd_palette(self, command, command_args, session_name, args) -> None:
+        new_command = CommandInterface.show_command_palette()
+        self._process_command(new_command, [], session_name, args)
+
+    def _cmd_dashboard(self, command, command_args, session_name, args) -> None:
+        if args.live:
+            self.dashboard.create_live_dashboard()
+        else:
+            self.dashboard.create_static_dashboard()
 
-        elif command == "dashboard":
-            if args.live:
-                self.dashboard.create_live_dashboard()
-            else:
-                self.dashboard.create_static_dashboard()
+    def _cmd_achievements(self, command, command_args, session_name, args) -> None:
+        achievements = self.db.get_achievements()
+        AchievementDisplay.display_achievements(achievements)
 
-        elif command == "achievements":
-            achievements = self.db.get_achievements()
-            AchievementDisplay.display_achievements(achievements)
+    def _cmd_health_check(self, command, command_args, session_name, args) -> None:
+        if self.system_monitor.available:
+            assessment = self.system_monitor.get_health_assessment()
+            SystemDisplayHelper.display_health_assessment(assessment)
+        else:
+            console.print("❌ System monitoring not available")
 
-        elif command == "health-check":
-            if self.system_monitor.available:
-                assessment = self.system_monitor.get_health_assessment()
-                SystemDisplayHelper.display_health_assessment(assessment)
-            else:
-                console.print("❌ System monitoring not available")
+    def _cmd_git_status(self, command, command_args, session_name, args) -> None:
+        if self.git_integration.available:
+            status = self.git_integration.get_status()
+            SystemDisplayHelper.display_git_status(status)
+        else:
+            console.print("❌ Git not available or not in repository")
 
-        elif command == "git-status":
-            if self.git_integration.available:
-                status = self.git_integration.get_status()
-                SystemDisplayHelper.display_git_status(status)
-            else:
-                console.print("❌ Git not available or not in repository")
+    def _cmd_git(self, command, command_args, session_name, args) -> None:
+        self._handle_git_commands(command, command_args, session_name)
 
-        elif command.startswith("git"):
-            self._handle_git_commands(command, command_args, session_name)
+    def _cmd_analyze(self, command, command_args, session_name, args) -> None:
+        self._handle_analyze_command(command_args)
 
-        elif command == "analyze":
-            self._handle_analyze_command(command_args)
+    def _cmd_analyze_dir(self, command, command_args, session_name, args) -> None:
+        self._handle_analyze_dir_command(command_args)
 
-        elif command == "analyze-dir":
-            self._handle_analyze_dir_command(command_args)
+    def _cmd_explain_code(self, command, command_args, session_name, args) -> None:
+        self._handle_explain_code_command(command_args, session_name)
 
-        elif command == "explain-code":
-            self._handle_explain_code_command(command_args, session_name)
+    def _cmd_project_summary(self, command, command_args, session_name, args) -> None:
+        self._handle_project_summary()
 
-        elif command == "project-summary":
-            self._handle_project_summary()
+    def _cmd_sessions(self, command, command_args, session_name, args) -> None:
+        SessionDisplayHelper.show_sessions(self.db)
 
-        elif command == "sessions":
-            SessionDisplayHelper.show_sessions(self.db)
+    def _cmd_search(self, command, command_args, session_name, args) -> None:
+        self._handle_search_command(command_args, session_name)
 
-        elif command == "search":
-            self._handle_search_command(command_args, session_name)
+    def _cmd_memory(self, command, command_args, session_name, args) -> None:
+        SessionDisplayHelper.show_memory_stats(self.db)
 
-        elif command == "memory":
-            SessionDisplayHelper.show_memory_stats(self.db)
+    def _cmd_models(self, command, command_args, session_name, args) -> None:
+        ModelDisplayHelper.show_available_models(self.ai)
 
-        elif command == "models":
-            ModelDisplayHelper.show_available_models(self.ai)
+    def _cmd_voice(self, command, command_args, session_name, args) -> None:
+        self._handle_voice_commands(session_name)
 
-        elif command == "voice":
-            self._handle_voice_commands(session_name)
+    def _cmd_config(self, command, command_args, session_name, args) -> None:
+        ModelDisplayHelper.show_config(self.config)
 
-        elif command == "config":
-            ModelDisplayHelper.show_config(self.config)
+    def _cmd_query(self, command, command_args, session_name, args) -> None:
+        full_query = " ".join([command] + command_args)
+        self._process_query(full_query, session_name, args)
 
-        else:
-            full_query = " ".join([command] + command_args)
-            self._process_query(full_query, session_name, args)
+    _COMMAND_HANDLERS = {
+        "help": _cmd_help,
+        "palette": _cmd_palette,
+        "dashboard": _cmd_dashboard,
+        "achievements": _cmd_achievements,
+        "health-check": _cmd_health_check,
+        "git-status": _cmd_git_status,
+        "analyze": _cmd_analyze,
+        "analyze-dir": _cmd_analyze_dir,
+        "explain-code": _cmd_explain_code,
+        "project-summary": _cmd_project_summary,
+        "sessions": _cmd_sessions,
+        "search": _cmd_search,
+        "memory": _cmd_memory,
+        "models": _cmd_models,
+        "voice": _cmd_voice,
+        "config": _cmd_config,
+    }
 
     def _process_query(self, user_input: str, session_name: str, args: argparse.Namespace) -> None:
         """Process a regular AI query"""
@@ -200,20 +273,48 @@ class SarekApplication:
         console.print("🤖 [dim]Thinking...[/dim]")
 
         try:
-            response, context = self.ai.query_with_context(session_name, user_input, model)
+            response, context = self._query_streaming(
+                session_name, user_input, model, f"🤖 Sarek ({model})", "green"
+            )
 
             self.db.save_conversation(session_name, user_input, response, context, model)
 
-            console.print(Panel(Markdown(response), title=f"🤖 Sarek ({model})", border_style="green"))
-
             if self.config.get('voice_enabled', False) and self.voice_interface.available:
                 self.voice_interface.speak(response)
 
         except Exception as e:
             console.print(f"❌ Error processing query: {e}")
 
+    def _query_streaming(self, session_name: str, prompt: str, model: str,
+                         title: str, border_style: str) -> Tuple[str, str]:
+        """Query the AI, rendering the response panel live as tokens arrive"""
+        from rich.live import Live
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
+        tokens = []
+        interval = 1.0 / STREAM_REFRESH_PER_SECOND
+        last_update = time.monotonic()
+
+        with Live(Panel(Markdown(""), title=title, border_style=border_style),
+                  console=console, refresh_per_second=STREAM_REFRESH_PER_SECOND) as live:
+
+            def on_token(token: str) -> None:
+                nonlocal last_update
+                tokens.append(token)
+                now = time.monotonic()
+                if now - last_update >= interval:
+                    last_update = now
+                    live.update(Panel(Markdown("".join(tokens)), title=title, border_style=border_style))
+
+            response, context = self.ai.query_with_context(session_name, prompt, model, on_token=on_token)
+            live.update(Panel(Markdown(response), title=title, border_style=border_style))
+            return response, context
+
     def _handle_git_commands(self, command: str, command_args: List[str], session_name: str) -> None:
         """Handle git-related commands"""
+        from rich.panel import Panel
+
         if not self.git_integration.available:
             console.print("❌ Git not available or not in a git repository")
             return
@@ -289,15 +390,33 @@ Respond with just the commit message, no explanation."""
             commit_hash = command_args[0]
             console.print(f"🤖 Explaining commit {commit_hash}...")
             try:
+                import os
                 import subprocess
 
-                result = subprocess.run(['git', 'show', '--stat', commit_hash],
-                                        capture_output=True, text=True)
-                if result.returncode != 0:
+                # Resolve branches, tags and abbreviations to the full commit id
+                # first; only that id names an immutable commit, so only it is
+                # safe to cache under
+                resolved = subprocess.run(
+                    ['git', 'rev-parse', '--verify', '--quiet', f'{commit_hash}^{{commit}}'],
+                    capture_output=True, text=True
+                )
+                if resolved.returncode != 0:
                     console.print(f"❌ Commit {commit_hash} not found")
                     return
 
-                commit_info = result.stdout[:2000]
+                full_sha = resolved.stdout.strip()
+                cache_key = f"{os.getcwd()}:git show --stat {full_sha}"
+                commit_info = self.db.get_cached_output(cache_key)
+
+                if commit_info is None:
+                    result = subprocess.run(['git', 'show', '--stat', full_sha],
+                                            capture_output=True, text=True)
+                    if result.returncode != 0:
+                        console.print(f"❌ Commit {commit_hash} not found")
+                        return
+
+                    commit_info = result.stdout[:2000]
+                    self.db.cache_output(cache_key, commit_info)
 
                 prompt = f"""Explain what this git commit does in simple terms:
 
@@ -305,7 +424,9 @@ Respond with just the commit message, no explanation."""
 
 Provide a clear, technical explanation of what was changed and why."""
 
-                response, context = self.ai.query_with_context(session_name, prompt, 'mistral')
+                response, context = self._query_streaming(
+                    session_name, prompt, 'mistral', f"📖 Commit {commit_hash}", "blue"
+                )
 
                 self.db.save_conversation(
                     session_name,
@@ -315,8 +436,6 @@ Provide a clear, technical explanation of what was changed and why."""
                     'mistral'
                 )
 
-                console.print(Panel(Markdown(response), title=f"📖 Commit {commit_hash}", border_style="blue"))
-
             except Exception as e:
                 console.print(f"❌ Error explaining commit: {e}")
 
@@ -345,7 +464,9 @@ Please provide:
 3. Security considerations
 4. Best practices recommendations"""
 
-                    response, context = self.ai.query_with_context(session_name, prompt, 'codellama')
+                    response, context = self._query_streaming(
+                        session_name, prompt, 'codellama', "📝 Code Review", "yellow"
+                    )
 
                     self.db.save_conversation(
                         session_name,
@@ -354,8 +475,6 @@ Please provide:
                         context,
                         'codellama'
                     )
-
-                    console.print(Panel(Markdown(response), title="📝 Code Review", border_style="yellow"))
                 else:
                     console.print("📝 No changes to review")
 
@@ -372,15 +491,13 @@ Please provide:
             console.print("❌ Please specify a file or directory to analyze")
             return
 
-        import os
-        from pathlib import Path
-
         target = command_args[0]
-        if os.path.isfile(target):
+        kind = _path_kind(target)
+        if kind == 'file':
             analysis = self.code_analyzer.analyze_file_with_progress(target)
             if analysis:
                 CodeDisplayHelper.display_code_analysis(analysis)
-        elif os.path.isdir(target):
+        elif kind == 'dir':
             self._analyze_directory_with_progress(target)
         else:
             console.print(f"❌ Path not found: {target}")
@@ -395,6 +512,8 @@ Please provide:
 
     def _handle_explain_code_command(self, command_args: List[str], session_name: str) -> None:
         """Handle code explanation command"""
+        from pathlib import Path
+
         if not command_args:
             console.print("❌ Please specify a file to explain")
             return
@@ -409,44 +528,52 @@ Please provide:
         try:
             analysis = self.code_analyzer.analyze_file_with_progress(file_path)
 
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                code_content = f.read()
-
-            if len(code_content) > 4000:
-                code_content = code_content[:4000] + "\n... (file truncated for analysis)"
-
-            file_info = ""
-            if analysis:
-                file_info = f"""
-File Analysis:
-- Language: {analysis.language}
-- Lines of Code: {analysis.lines_of_code}
-- Functions: {', '.join(analysis.functions[:5])} {'...' if len(analysis.functions) > 5 else ''}
-- Classes: {', '.join(analysis.classes)} 
-- Complexity Score: {analysis.complexity_score:.2f}
-"""
-
-            prompt = f"""Analyze and explain this code file:
+            # Only the first 4000 bytes go into the prompt, so don't load the rest;
+            # one extra byte tells us whether anything was cut off
+            with open(file_path, 'rb') as f:
+                head = f.read(4001)
 
-File: {Path(file_path).name}
-{file_info}
+            truncated = len(head) > 4000
+            code_content = head[:4000].decode('utf-8', errors='ignore')
 
-Code:
-```{analysis.language if analysis else 'text'}
-{code_content}
-```
+            if truncated:
+                code_content += "\n... (file truncated for analysis)"
 
-Please provide:
-1. High-level overview of what this code does
-2. Key functions/classes and their purposes  
-3. Code quality assessment
-4. Potential improvements or issues
-5. Security considerations (if any)
-
-Be detailed but concise."""
+            language = analysis.language if analysis else 'text'
+            parts = ["Analyze and explain this code file:", "", f"File: {Path(file_path).name}"]
+            if analysis:
+                more_functions = " ..." if len(analysis.functions) > 5 else ""
+                parts += [
+                    "",
+                    "File Analysis:",
+                    f"- Language: {analysis.language}",
+                    f"- Lines of Code: {analysis.lines_of_code}",
+                    f"- Functions: {', '.join(analysis.functions[:5])}{more_functions}",
+                    f"- Classes: {', '.join(analysis.classes)}",
+                    f"- Complexity Score: {analysis.complexity_score:.2f}",
+                ]
+            parts += [
+                "",
+                "Code:",
+                f"```{language}",
+                code_content,
+                "```",
+                "",
+                "Please provide:",
+                "1. High-level overview of what this code does",
+                "2. Key functions/classes and their purposes",
+                "3. Code quality assessment",
+                "4. Potential improvements or issues",
+                "5. Security considerations (if any)",
+                "",
+                "Be detailed but concise.",
+            ]
+            prompt = "\n".join(parts)
 
             model = 'codellama' if analysis and analysis.language == 'python' else 'mistral'
-            response, context = self.ai.query_with_context(session_name, prompt, model)
+            response, context = self._query_streaming(
+                session_name, prompt, model, f"🤖 AI Analysis: {Path(file_path).name}", "green"
+            )
 
             self.db.save_conversation(
                 session_name,
@@ -456,9 +583,6 @@ Be detailed but concise."""
                 model
             )
 
-            console.print(
-                Panel(Markdown(response), title=f"🤖 AI Analysis: {Path(file_path).name}", border_style="green"))
-
         except Exception as e:
             console.print(f"❌ Error explaining code: {e}")
 
@@ -500,11 +624,9 @@ Be detailed but concise."""
 
             console.print("🤖 [dim]Processing...[/dim]")
             try:
-                response, context = self.ai.query_with_context(session_name, user_input)
+                response, context = self._query_streaming(session_name, user_input, None, "🤖 Sarek", "green")
 
                 self.db.save_conversation(session_name, user_input, response, context)
-
-                console.print(Panel(Markdown(response), title="🤖 Sarek", border_style="green"))
                 self.voice_interface.speak(response)
 
             except Exception as e:
@@ -517,17 +639,12 @@ Be detailed but concise."""
 
         console.print(f"🔍 [bold cyan]Analyzing directory: {directory}[/bold cyan]")
 
-        path = Path(directory)
-        all_files = []
-        for ext in self.code_analyzer.supported_extensions.keys():
-            all_files.extend(path.rglob(f"*{ext}"))
+        all_files = list(self.code_analyzer.iter_source_files(directory))
 
         if not all_files:
             console.print("❌ No supported code files found")
             return
 
-        analyses = []
-
         with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
@@ -538,17 +655,29 @@ Be detailed but concise."""
 
             task = progress.add_task("Analyzing files...", total=len(all_files))
 
-            for file_path in all_files:
-                progress.update(task, description=f"Analyzing {file_path.name}...")
-                analysis = self.code_analyzer.analyze_file_with_progress(str(file_path))
-                if analysis:
-                    analyses.append(analysis)
+            def on_file(file_path: str) -> None:
+                progress.update(task, description=f"Analyzed {Path(file_path).name}")
                 progress.advance(task)
 
+            analyses = self.code_analyzer.analyze_directory(all_files, on_file)
+
         if analyses:
             CodeDisplayHelper.display_directory_summary(analyses, directory)
 
 
+def _path_kind(path: str) -> Optional[str]:
+    """Classify a user-supplied path as 'file' or 'dir' with a single stat"""
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return None
+    if stat.S_ISREG(mode):
+        return 'file'
+    if stat.S_ISDIR(mode):
+        return 'dir'
+    return None
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create command line argument parser"""
     parser = argparse.ArgumentParser(
@@ -580,7 +709,16 @@ def main() -> None:
             args = argparse.Namespace(command=[], help=True)
 
         app = SarekApplication()
-        app.run(args)
+        try:
+            app.run(args)
+        except KeyboardInterrupt:
+            app.interrupted = True
+            raise
+        finally:
+            # Let a reply that is still being read out finish before exiting
+            if 'voice_interface' in vars(app) and not app.interrupted:
+                app.voice_interface.flush_speech(timeout=SPEECH_FLUSH_TIMEOUT)
+            app.db.close()
 
     except KeyboardInterrupt:
         console.print("\n👋 Interrupted. Live long and prosper!")
@@ -3,14 +3,13 @@
 Command interface and help system for Sarek AI Assistant
 """
 
+import os
 import time
+from collections import Counter
 from typing import Dict, List, Any
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.prompt import IntPrompt
-from rich.tree import Tree
-from rich.markdown import Markdown
 from pathlib import Path
 
 from ..constants import SAREK_LOGO, SMART_ALIASES
@@ -140,6 +139,8 @@ class CommandInterface:
     @staticmethod
     def show_command_palette() -> str:
         """Comprehensive command reference with working status"""
+        from rich.prompt import IntPrompt
+
         console.print("🖖 [bold cyan]Sarek Complete Command Reference[/bold cyan]\n")
 
         working_table = Table(title="✅ Confirmed Working Commands")
@@ -261,6 +262,8 @@ class CodeDisplayHelper:
     @staticmethod
     def display_code_analysis(analysis) -> None:
         """Display enhanced code analysis"""
+        from rich.tree import Tree
+
         tree = Tree(f"📄 [bold cyan]{Path(analysis.file_path).name}[/bold cyan]")
 
         metrics = tree.add("📊 Code Metrics")
@@ -312,30 +315,35 @@ class CodeDisplayHelper:
         table.add_column("LOC", style="green", justify="right")
         table.add_column("Complexity", style="magenta", justify="right")
         table.add_column("Issues", style="red", justify="right")
-        table.add_column("Security", style="orange", justify="right")
+        table.add_column("Security", style="orange1", justify="right")
 
         total_loc = 0
         total_files = len(analyses)
-        languages = {}
+        languages = Counter()
         total_issues = 0
         total_security = 0
 
         for analysis in analyses:
-            total_loc += analysis.lines_of_code
-            languages[analysis.language] = languages.get(analysis.language, 0) + 1
-            total_issues += len(analysis.issues)
-            total_security += len(analysis.security_issues or [])
+            loc = analysis.lines_of_code
+            language = analysis.language
+            complexity = analysis.complexity_score
+            issue_count = len(analysis.issues)
+            security_count = len(analysis.security_issues or ())
+
+            total_loc += loc
+            languages[language] += 1
+            total_issues += issue_count
+            total_security += security_count
 
-            file_name = Path(analysis.file_path).name
-            complexity_color = "red" if analysis.complexity_score > 5 else "green"
+            complexity_color = "red" if complexity > 5 else "green"
 
             table.add_row(
-                file_name,
-                analysis.language,
-                f"{analysis.lines_of_code:,}",
-                f"[{complexity_color}]{analysis.complexity_score:.1f}[/{complexity_color}]",
-                str(len(analysis.issues)),
-                str(len(analysis.security_issues or []))
+                os.path.basename(analysis.file_path),
+                language,
+                f"{loc:,}",
+                f"[{complexity_color}]{complexity:.1f}[/{complexity_color}]",
+                str(issue_count),
+                str(security_count)
             )
 
         console.print(table)
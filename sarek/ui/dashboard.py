@@ -4,19 +4,18 @@ Dashboard UI components for Sarek AI Assistant
 """
 
 import time
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
 from rich.console import Console
-from rich.layout import Layout
 from rich.panel import Panel
 from rich.table import Table
-from rich.live import Live
-from rich.tree import Tree
-from rich.text import Text
 
 from ..core.config import ConfigManager
 from ..core.database import EnhancedMemoryDB
-from ..features.system_monitor import SystemMonitor
-from ..features.git_integration import GitIntegration
+
+if TYPE_CHECKING:
+    from rich.layout import Layout
+    from ..features.system_monitor import SystemMonitor
+    from ..features.git_integration import GitIntegration
 
 console = Console()
 
@@ -25,7 +24,7 @@ class Dashboard:
     """Main dashboard for displaying system information"""
 
     def __init__(self, config: ConfigManager, db: EnhancedMemoryDB,
-                 system_monitor: SystemMonitor, git_integration: GitIntegration):
+                 system_monitor: "SystemMonitor", git_integration: "GitIntegration"):
         self.config = config
         self.db = db
         self.system_monitor = system_monitor
@@ -45,6 +44,8 @@ class Dashboard:
 
     def create_live_dashboard(self) -> None:
         """Create a live updating dashboard"""
+        from rich.live import Live
+
         console.print("🚀 [bold cyan]Starting live dashboard...[/bold cyan]")
         console.print("[dim]Updates every 2 seconds. Press Ctrl+C to exit.[/dim]\n")
 
@@ -56,8 +57,10 @@ class Dashboard:
         except KeyboardInterrupt:
             console.print("\n👋 Dashboard closed.")
 
-    def _create_live_layout(self) -> Layout:
+    def _create_live_layout(self) -> "Layout":
         """Create the live dashboard layout"""
+        from rich.layout import Layout
+
         layout = Layout()
 
         layout.split_column(
@@ -194,12 +197,18 @@ class Dashboard:
 
     def _display_project_info(self) -> None:
         """Display current project information"""
+        import os
         from pathlib import Path
 
         current_dir = Path.cwd()
-        file_count = len(list(current_dir.iterdir()))
-        python_files = len(list(current_dir.glob('*.py')))
-        has_git = (current_dir / '.git').exists()
+        # One readdir pass; DirEntry answers is_file() without extra stats
+        file_count = python_files = 0
+        with os.scandir(current_dir) as entries:
+            for entry in entries:
+                file_count += 1
+                if entry.name.endswith('.py') and entry.is_file(follow_symlinks=False):
+                    python_files += 1
+        has_git = os.path.exists(os.path.join(current_dir, '.git'))
 
         content = (
             f"📁 [bold]Directory:[/bold] {current_dir.name}\n"